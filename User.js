@@ -7,6 +7,7 @@ const userSchema = new mongoose.Schema({
   company: { type: String, required: true },
   password: { type: String, required: true },
   apiKey: { type: String, default: null },
+  apiKeyHash: { type: Buffer, default: null },
 }, { timestamps: true });
 
 // Hash password before saving
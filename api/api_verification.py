@@ -1,7 +1,22 @@
-from flask import Blueprint, request, jsonify
-from pymongo import MongoClient
+from flask import Blueprint, request, current_app, g
+from pymongo import MongoClient, UpdateOne
+from pymongo.errors import PyMongoError
+from bson.binary import Binary
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
+from cachetools import TTLCache
+import orjson
 import os
+import hashlib
 import logging
+import threading
+import math
+import time
+
+try:
+    import redis
+except ImportError:
+    redis = None
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -20,109 +35,707 @@ COLLECTION_NAME = 'users'
 client = None
 db = None
 api_keys_collection = None
+# Same collection, but documents come back as RawBSONDocument and fields are only
+# decoded when read; verify_key reads the three projected fields and nothing else
+raw_keys_collection = None
+_RAW_CODEC_OPTIONS = CodecOptions(document_class=RawBSONDocument)
 
-if MONGO_URI:
+# In-process cache for verify_key lookups so repeated keys skip the MongoDB round-trip.
+# Found keys are kept for KEY_CACHE_TTL seconds so revocations still propagate quickly;
+# unknown keys get a much shorter TTL to blunt credential-stuffing without hiding new keys.
+KEY_CACHE_TTL = int(os.environ.get('KEY_CACHE_TTL', 60))
+NEGATIVE_CACHE_TTL = int(os.environ.get('NEGATIVE_CACHE_TTL', 5))
+KEY_CACHE_SIZE = int(os.environ.get('KEY_CACHE_SIZE', 10000))
+
+_key_cache = TTLCache(maxsize=KEY_CACHE_SIZE, ttl=KEY_CACHE_TTL)
+_negative_cache = TTLCache(maxsize=KEY_CACHE_SIZE, ttl=NEGATIVE_CACHE_TTL)
+_cache_lock = threading.RLock()
+_cache_stats = {"hits": 0, "misses": 0}
+_MISS = object()
+
+# Upper bound on keys accepted by /verify_keys in one request
+MAX_BATCH_KEYS = 500
+
+# Per-client rate limits for the verification endpoints (0 disables a window; both are off
+# unless configured). Clients are told apart by remote_addr, so behind a reverse proxy set
+# TRUST_PROXY_HEADERS too, or every client shares the proxy's single budget. Every key
+# costs one token, so a /verify_keys batch is charged per key, and keys that fail format
+# validation or are unknown cost FAILED_LOOKUP_COST tokens against the per-minute budget
+# so key scanners run dry much sooner.
+RATE_LIMIT_PER_SECOND = int(os.environ.get('RATE_LIMIT_PER_SECOND', 0))
+RATE_LIMIT_PER_MINUTE = int(os.environ.get('RATE_LIMIT_PER_MINUTE', 0))
+FAILED_LOOKUP_COST = int(os.environ.get('FAILED_LOOKUP_COST', 5))
+# Only honour X-Forwarded-For when the API sits behind exactly one proxy that appends to it
+TRUST_PROXY_HEADERS = os.environ.get('TRUST_PROXY_HEADERS', '').lower() in ('1', 'true', 'yes')
+_RATE_LIMITED_ENDPOINTS = ('api_verification.verify_key', 'api_verification.verify_keys')
+
+_rate_windows = {
+    "second": (1, RATE_LIMIT_PER_SECOND, TTLCache(maxsize=KEY_CACHE_SIZE, ttl=1)),
+    "minute": (60, RATE_LIMIT_PER_MINUTE, TTLCache(maxsize=KEY_CACHE_SIZE, ttl=60))
+}
+
+# Optional in-memory Bloom filter of every issued key hash (set KEY_FILTER_REFRESH_SECONDS
+# to enable). Keys the filter has never seen are rejected without a Redis or MongoDB call.
+# New keys are picked up from a change stream when the deployment supports one, otherwise
+# only on the next periodic rebuild.
+KEY_FILTER_REFRESH_SECONDS = int(os.environ.get('KEY_FILTER_REFRESH_SECONDS', 0))
+KEY_FILTER_ERROR_RATE = 1e-4
+KEY_FILTER_MIN_CAPACITY = 100000
+_key_filter = None
+_key_filter_built_at = None
+_key_filter_watching = False
+
+# Optional Redis cache shared by all worker processes (set REDIS_URI to enable).
+# Keys are stored as SHA-256 digests so raw API keys never land in Redis snapshots.
+REDIS_URI = os.environ.get('REDIS_URI')
+REDIS_MAX_CONNECTIONS = int(os.environ.get('REDIS_MAX_CONNECTIONS', 50))
+redis_client = None
+
+if REDIS_URI:
+    if redis is None:
+        logger.warning("⚠️ REDIS_URI is set but the redis package is not installed. Using the in-process key cache only.")
+    else:
+        try:
+            redis_client = redis.Redis.from_url(REDIS_URI, decode_responses=True,
+                                                max_connections=REDIS_MAX_CONNECTIONS,
+                                                socket_timeout=0.5, socket_connect_timeout=0.5)
+            redis_client.ping()
+            logger.info("✅ Redis cache connection successful")
+        except Exception as e:
+            logger.error(f"❌ Redis connection failed: {e}")
+            logger.error("Falling back to the in-process key cache")
+            redis_client = None
+
+# One MongoClient per process with an explicitly sized pool. Sockets and TLS sessions
+# are reused across requests instead of each worker growing an unbounded default pool.
+MONGO_CLIENT_OPTIONS = {
+    'serverSelectionTimeoutMS': 5000,
+    'maxPoolSize': int(os.environ.get('MONGO_MAX_POOL_SIZE', 50)),
+    'minPoolSize': int(os.environ.get('MONGO_MIN_POOL_SIZE', 5)),
+    'maxIdleTimeMS': 60000,
+    'socketTimeoutMS': 3000,
+    'connectTimeoutMS': 3000,
+    'retryReads': True,
+    'appname': 'api_verification'
+}
+
+# Load balancers probe /health every few seconds; the MongoDB ping behind it is
+# cached for HEALTH_PING_INTERVAL seconds as [last ping time, last result]
+HEALTH_PING_INTERVAL = int(os.environ.get('HEALTH_PING_INTERVAL', 10))
+_last_ping = [0.0, True]
+
+# PID that owns the current client; a forked worker must never reuse its parent's client
+_client_pid = None
+
+# Documents written before apiKeyHash existed are given one by backfill_key_hashes() at
+# startup, so verify_key only ever runs the indexed hash lookup. LEGACY_KEY_LOOKUP restores
+# the per-request raw-key fallback (a second query for every unknown key) for deployments
+# where other writers still create raw-key-only documents.
+LEGACY_KEY_LOOKUP = os.environ.get('LEGACY_KEY_LOOKUP', '').lower() in ('1', 'true', 'yes')
+BACKFILL_BATCH_SIZE = 1000
+
+def ensure_indexes(collection):
+    """Create the API key indexes used by verify_key (idempotent)"""
+    # Lookups go through the fixed-length SHA-256 digest; 32-byte keys pack denser B-tree
+    # pages than raw UUID strings. Users without a key are excluded via the partial filter.
+    try:
+        collection.create_index("apiKeyHash", unique=True, name="apiKeyHash_unique",
+                                partialFilterExpression={"apiKeyHash": {"$type": "binData"}})
+    except Exception as e:
+        logger.warning(f"⚠️ Could not create unique apiKeyHash index: {e}")
+    
+    # An earlier release added a compound "covered" index with the same apiKeyHash prefix; the
+    # planner picks the unique index for verify_key anyway, so the copy only costs writes
+    try:
+        if "apiKeyHash_covered" in collection.index_information():
+            collection.drop_index("apiKeyHash_covered")
+    except Exception as e:
+        logger.warning(f"⚠️ Could not drop redundant apiKeyHash_covered index: {e}")
+    
+    # Raw apiKey is still written by the auth server; index it for legacy documents
+    # that have not been given an apiKeyHash yet (users without a key store null)
+    try:
+        collection.create_index("apiKey", unique=True, name="apiKey_unique",
+                                partialFilterExpression={"apiKey": {"$type": "string"}})
+    except Exception as e:
+        logger.warning(f"⚠️ Could not create unique apiKey index: {e}")
+
+def backfill_key_hashes(collection):
+    """Give every document that only carries a raw apiKey its apiKeyHash (idempotent)"""
+    cursor = collection.find({"apiKey": {"$type": "string"}, "apiKeyHash": None},
+                             {"apiKey": 1}, batch_size=BACKFILL_BATCH_SIZE)
+    updated = 0
+    ops = []
+    for doc in cursor:
+        key_hash = Binary(hashlib.sha256(doc["apiKey"].encode()).digest())
+        ops.append(UpdateOne({"_id": doc["_id"], "apiKeyHash": None}, {"$set": {"apiKeyHash": key_hash}}))
+        if len(ops) == BACKFILL_BATCH_SIZE:
+            updated += collection.bulk_write(ops, ordered=False).modified_count
+            ops = []
+    if ops:
+        updated += collection.bulk_write(ops, ordered=False).modified_count
+    if updated:
+        logger.info(f"✅ Backfilled apiKeyHash for {updated} legacy API keys")
+    return updated
+
+class _KeyFilter:
+    """Fixed-size Bloom filter over 32-byte SHA-256 digests"""
+    
+    def __init__(self, capacity, error_rate=KEY_FILTER_ERROR_RATE):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+    
+    def _positions(self, digest):
+        # The digest is already uniformly distributed, so two 64-bit halves are
+        # enough to derive every probe position (Kirsch-Mitzenmacher double hashing)
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:16], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+    
+    def add(self, digest):
+        for pos in self._positions(digest):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+    
+    def __contains__(self, digest):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(digest))
+
+def _doc_digest(doc):
+    """SHA-256 digest of a user document's API key, or None if it has no key"""
+    if doc.get("apiKeyHash") is not None:
+        return bytes(doc["apiKeyHash"])
+    if isinstance(doc.get("apiKey"), str):
+        return hashlib.sha256(doc["apiKey"].encode()).digest()
+    return None
+
+def build_key_filter(collection):
+    """Stream every issued key out of MongoDB into a fresh Bloom filter"""
+    global _key_filter, _key_filter_built_at
+    
+    started = time.monotonic()
+    capacity = max(collection.estimated_document_count() * 2, KEY_FILTER_MIN_CAPACITY)
+    key_filter = _KeyFilter(capacity)
+    cursor = collection.find({"$or": [{"apiKeyHash": {"$type": "binData"}}, {"apiKey": {"$type": "string"}}]},
+                             {"apiKey": 1, "apiKeyHash": 1, "_id": 0}, batch_size=10000)
+    for doc in cursor:
+        digest = _doc_digest(doc)
+        if digest is not None:
+            key_filter.add(digest)
+    
+    # Swap the reference in one assignment so readers never see a half-built filter
+    _key_filter = key_filter
+    _key_filter_built_at = time.time()
+    logger.info(f"✅ API key filter built with {key_filter.count} keys in {time.monotonic() - started:.2f}s")
+    return key_filter
+
+def _watch_new_keys(collection):
+    """Add newly issued keys to the filter as soon as MongoDB reports them"""
+    global _key_filter_watching
+    
+    pipeline = [{"$match": {"operationType": {"$in": ["insert", "update", "replace"]}}}]
+    try:
+        with collection.watch(pipeline, full_document="updateLookup") as stream:
+            _key_filter_watching = True
+            for change in stream:
+                digest = _doc_digest(change.get("fullDocument") or {})
+                key_filter = _key_filter
+                if digest is not None and key_filter is not None:
+                    key_filter.add(digest)
+    except Exception as e:
+        logger.warning(f"⚠️ API key change stream unavailable, relying on periodic filter rebuilds: {e}")
+    finally:
+        _key_filter_watching = False
+
+def _refresh_key_filter(collection, pid):
+    """Rebuild the filter every KEY_FILTER_REFRESH_SECONDS for the owning process"""
+    while _client_pid == pid:
+        time.sleep(KEY_FILTER_REFRESH_SECONDS)
+        if _client_pid != pid:
+            break
+        try:
+            build_key_filter(collection)
+        except Exception as e:
+            logger.warning(f"⚠️ API key filter refresh failed, keeping the previous filter: {e}")
+        if not _key_filter_watching:
+            threading.Thread(target=_watch_new_keys, args=(collection,), daemon=True).start()
+
+def start_key_filter(collection):
+    """Build the key filter and start its background refresh threads"""
+    global _key_filter
+    
+    try:
+        build_key_filter(collection)
+    except Exception as e:
+        logger.warning(f"⚠️ Could not build API key filter, lookups will go to the database: {e}")
+        _key_filter = None
+        return
+    
+    threading.Thread(target=_watch_new_keys, args=(collection,), daemon=True).start()
+    threading.Thread(target=_refresh_key_filter, args=(collection, os.getpid()), daemon=True).start()
+
+def init_mongo():
+    """Create this process's MongoClient and collection handle"""
+    global client, db, api_keys_collection, raw_keys_collection, _client_pid
+    
+    _client_pid = os.getpid()
+    if not MONGO_URI:
+        return None
+    
     logger.info(f"Attempting to connect to MongoDB...")
     logger.info(f"Database: {DB_NAME}")
     logger.info(f"Collection: {COLLECTION_NAME}")
     
     try:
-        client = MongoClient(MONGO_URI, serverSelectionTimeoutMS=5000)
+        client = MongoClient(MONGO_URI, **MONGO_CLIENT_OPTIONS)
         # Test the connection
         client.admin.command('ping')
         logger.info("✅ MongoDB connection successful")
         db = client[DB_NAME]
         api_keys_collection = db[COLLECTION_NAME]
+        raw_keys_collection = db.get_collection(COLLECTION_NAME, codec_options=_RAW_CODEC_OPTIONS)
+        ensure_indexes(api_keys_collection)
+        try:
+            backfill_key_hashes(api_keys_collection)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not backfill apiKeyHash for legacy API keys: {e}")
+        if KEY_FILTER_REFRESH_SECONDS > 0:
+            start_key_filter(api_keys_collection)
     except Exception as e:
         logger.error(f"❌ MongoDB connection failed: {e}")
         logger.error("Please check your MONGODB_URI environment variable")
         client = None
         db = None
         api_keys_collection = None
+        raw_keys_collection = None
+    
+    return api_keys_collection
+
+def get_collection(raw=False):
+    """Return the users collection (RawBSONDocument-typed if raw), creating a fresh client after a fork"""
+    if _client_pid != os.getpid():
+        init_mongo()
+    return raw_keys_collection if raw else api_keys_collection
+
+if MONGO_URI:
+    init_mongo()
 else:
+    _client_pid = os.getpid()
     logger.warning("⚠️ MONGODB_URI environment variable not set. MongoDB features will be disabled.")
     logger.warning("To enable MongoDB, set the MONGODB_URI environment variable with your MongoDB Atlas connection string.")
 
+def _json(payload, status=200):
+    """Build a JSON response with orjson instead of the stdlib encoder"""
+    return current_app.response_class(orjson.dumps(payload), status=status, mimetype="application/json")
+
+# Fixed error responses are serialized once at import time
+_ERR_NOKEY = (orjson.dumps({"valid": False, "reason": "API key not provided"}), 400)
+_ERR_BADKEY = (orjson.dumps({"valid": False, "reason": "Invalid API key format"}), 400)
+_ERR_NOTFOUND = (orjson.dumps({"valid": False, "reason": "API key not found"}), 404)
+_ERR_NODB = (orjson.dumps({"valid": False, "reason": "Database connection not available. Please configure MongoDB."}), 500)
+_ERR_DBQUERY = (orjson.dumps({"valid": False, "reason": "Database query failed"}), 500)
+_ERR_INTERNAL = (orjson.dumps({"valid": False, "reason": "Internal server error"}), 500)
+_ERR_UNHEALTHY = (orjson.dumps({"service": "api_verification", "status": "unhealthy"}), 500)
+_ERR_RATELIMIT = (orjson.dumps({"valid": False, "reason": "Rate limit exceeded"}), 429)
+
+def _error(err):
+    """Build a response from one of the pre-serialized _ERR_* bodies"""
+    body, status = err
+    return current_app.response_class(body, status=status, mimetype="application/json")
+
+def _mask(api_key):
+    """Mask an API key for logging"""
+    return f"{api_key[:8]}...{api_key[-4:]}" if len(api_key) > 12 else "***"
+
+# Projections are built once; documents missing one of these fields report it as ""
+_PROJECTION = {"email": 1, "name": 1, "company": 1, "_id": 0}
+_BATCH_PROJECTION = {"apiKeyHash": 1, "email": 1, "name": 1, "company": 1, "_id": 0}
+_LEGACY_PROJECTION = {"apiKey": 1, "email": 1, "name": 1, "company": 1, "_id": 0}
+
+def _find_user(collection, api_key):
+    """Look up a user by the SHA-256 of their API key (one indexed query)"""
+    key_hash = Binary(hashlib.sha256(api_key.encode()).digest())
+    
+    record = collection.find_one({"apiKeyHash": key_hash}, _PROJECTION)
+    if record is None and LEGACY_KEY_LOOKUP:
+        # Documents created before apiKeyHash existed only carry the raw key
+        record = collection.find_one({"apiKey": api_key, "apiKeyHash": None}, _PROJECTION)
+        if record is not None:
+            collection.update_one({"apiKey": api_key}, {"$set": {"apiKeyHash": key_hash}})
+    return record
+
+def _find_users(collection, api_keys):
+    """Batch variant of _find_user: returns {api_key: record} for the keys that exist"""
+    by_hash = {hashlib.sha256(k.encode()).digest(): k for k in api_keys}
+    
+    found = {}
+    cursor = collection.find({"apiKeyHash": {"$in": [Binary(h) for h in by_hash]}},
+                             _BATCH_PROJECTION, batch_size=MAX_BATCH_KEYS)
+    for record in cursor:
+        found[by_hash[bytes(record.pop("apiKeyHash"))]] = record
+    
+    missing = [k for k in api_keys if k not in found] if LEGACY_KEY_LOOKUP else []
+    if missing:
+        # Documents created before apiKeyHash existed only carry the raw key
+        cursor = collection.find({"apiKey": {"$in": missing}, "apiKeyHash": None},
+                                 _LEGACY_PROJECTION, batch_size=MAX_BATCH_KEYS)
+        for record in cursor:
+            api_key = record.pop("apiKey")
+            found[api_key] = record
+            key_hash = Binary(hashlib.sha256(api_key.encode()).digest())
+            collection.update_one({"apiKey": api_key}, {"$set": {"apiKeyHash": key_hash}})
+    return found
+
+def _redis_key(api_key):
+    """Redis key for an API key (hashed, never the raw key)"""
+    return "apikey:" + hashlib.sha256(api_key.encode()).hexdigest()
+
+def _cache_local(api_key, entry):
+    """Store a lookup result in the in-process cache"""
+    with _cache_lock:
+        if entry is None:
+            _negative_cache[api_key] = True
+        else:
+            _key_cache[api_key] = entry
+
+def _cache_get(api_key):
+    """Return cached (email, name, company), None for an unknown key, or _MISS"""
+    with _cache_lock:
+        cached = _key_cache.get(api_key, _MISS)
+        if cached is _MISS and api_key in _negative_cache:
+            cached = None
+    
+    if cached is _MISS and redis_client is not None:
+        try:
+            payload = redis_client.get(_redis_key(api_key))
+        except Exception as e:
+            logger.warning(f"Redis lookup failed, using local cache only: {e}")
+            payload = None
+        if payload is not None:
+            record = orjson.loads(payload)
+            cached = tuple(record) if record is not None else None
+            _cache_local(api_key, cached)
+    
+    with _cache_lock:
+        if cached is _MISS:
+            _cache_stats["misses"] += 1
+        else:
+            _cache_stats["hits"] += 1
+    return cached
+
+def _cache_get_many(api_keys):
+    """Batch variant of _cache_get: returns {api_key: entry} for cache hits only"""
+    results = {}
+    with _cache_lock:
+        for api_key in api_keys:
+            cached = _key_cache.get(api_key, _MISS)
+            if cached is _MISS and api_key in _negative_cache:
+                cached = None
+            if cached is not _MISS:
+                results[api_key] = cached
+    
+    pending = [k for k in api_keys if k not in results]
+    if pending and redis_client is not None:
+        try:
+            payloads = redis_client.mget([_redis_key(k) for k in pending])
+        except Exception as e:
+            logger.warning(f"Redis lookup failed, using local cache only: {e}")
+            payloads = []
+        for api_key, payload in zip(pending, payloads):
+            if payload is not None:
+                record = orjson.loads(payload)
+                results[api_key] = tuple(record) if record is not None else None
+                _cache_local(api_key, results[api_key])
+    
+    with _cache_lock:
+        _cache_stats["hits"] += len(results)
+        _cache_stats["misses"] += len(api_keys) - len(results)
+    return results
+
+def _cache_set_many(entries):
+    """Batch variant of _cache_set using a single Redis pipeline"""
+    for api_key, entry in entries.items():
+        _cache_local(api_key, entry)
+    if redis_client is not None and entries:
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            for api_key, entry in entries.items():
+                ttl = NEGATIVE_CACHE_TTL if entry is None else KEY_CACHE_TTL
+                pipe.setex(_redis_key(api_key), ttl, orjson.dumps(entry))
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Redis write failed, using local cache only: {e}")
+
+def _cache_set(api_key, entry):
+    """Store a lookup result locally and, when configured, in Redis"""
+    _cache_local(api_key, entry)
+    if redis_client is not None:
+        ttl = NEGATIVE_CACHE_TTL if entry is None else KEY_CACHE_TTL
+        try:
+            redis_client.setex(_redis_key(api_key), ttl, orjson.dumps(entry))
+        except Exception as e:
+            logger.warning(f"Redis write failed, using local cache only: {e}")
+
+def _client_ip():
+    """Address the rate limits are keyed on"""
+    if TRUST_PROXY_HEADERS:
+        forwarded = request.headers.get("X-Forwarded-For")
+        if forwarded:
+            # The last entry is the one our proxy added; earlier ones are client-supplied
+            return forwarded.split(",")[-1].strip()
+    return request.remote_addr or "unknown"
+
+def _rate_charge(ip, cost, windows):
+    """Add cost tokens to the given windows and return the highest overshoot ratio"""
+    now = int(time.time())
+    counts = {}
+    if redis_client is not None:
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            for name in windows:
+                period = _rate_windows[name][0]
+                key = f"ratelimit:{name}:{ip}:{now // period}"
+                pipe.incrby(key, cost)
+                pipe.expire(key, period + 1)
+            replies = pipe.execute()
+            counts = dict(zip(windows, replies[::2]))
+        except Exception as e:
+            logger.warning(f"Redis rate limit failed, using local counters only: {e}")
+            counts = {}
+    
+    if not counts:
+        with _cache_lock:
+            for name in windows:
+                period, _, local = _rate_windows[name]
+                key = (ip, now // period)
+                local[key] = local.get(key, 0) + cost
+                counts[name] = local[key]
+    
+    return max(counts[name] / _rate_windows[name][1] for name in windows)
+
+def _rate_limit_exceeded(ip, cost=1):
+    """Charge cost tokens to the client's budget and report whether it is over the limit"""
+    windows = [name for name, (_, limit, _) in _rate_windows.items() if limit > 0]
+    if not windows:
+        return False
+    return _rate_charge(ip, cost, windows) > 1
+
+def _request_cost():
+    """Tokens a verification request costs up front: one per key it asks about"""
+    if request.endpoint == 'api_verification.verify_keys':
+        api_keys = (request.get_json(silent=True) or {}).get('api_keys')
+        if isinstance(api_keys, list):
+            return max(1, min(len(api_keys), MAX_BATCH_KEYS))
+    return 1
+
+@api_verification_bp.before_request
+def enforce_rate_limit():
+    """Reject verification requests from clients that are over their budget"""
+    if request.endpoint not in _RATE_LIMITED_ENDPOINTS:
+        return None
+    if _rate_limit_exceeded(_client_ip(), _request_cost()):
+        response = _error(_ERR_RATELIMIT)
+        response.headers["Retry-After"] = "60"
+        return response
+    return None
+
+@api_verification_bp.before_request
+def validate_key_format():
+    """Reject missing or malformed keys before the verify_key view is dispatched"""
+    if request.endpoint != 'api_verification.verify_key':
+        return None
+    api_key = request.args.get('api_key')
+    if not api_key:
+        return _error(_ERR_NOKEY)
+    if len(api_key) < 10:
+        return _error(_ERR_BADKEY)
+    return None
+
+@api_verification_bp.after_request
+def charge_failed_lookup(response):
+    """Charge malformed or unknown keys extra tokens against the per-minute budget"""
+    if FAILED_LOOKUP_COST <= 1 or RATE_LIMIT_PER_MINUTE <= 0:
+        return response
+    if request.endpoint == 'api_verification.verify_key' and response.status_code in (400, 404):
+        failed = 1
+    elif request.endpoint == 'api_verification.verify_keys':
+        # verify_keys records how many of its keys were malformed or unknown
+        failed = 1 if response.status_code == 400 else g.get('failed_lookups', 0)
+    else:
+        failed = 0
+    if failed:
+        _rate_charge(_client_ip(), failed * (FAILED_LOOKUP_COST - 1), ["minute"])
+    return response
+
+@api_verification_bp.errorhandler(500)
+def internal_error(error):
+    """Keep the JSON error contract for unexpected failures in the verification views"""
+    return _error(_ERR_INTERNAL)
+
 @api_verification_bp.route('/verify_key', methods=['GET'])
 def verify_key():
     """Verify API key with improved error handling and memory management"""
+    # Get API key from query parameters (format already checked by validate_key_format)
+    api_key = request.args['api_key']
+    
+    # Log the request (without the full API key for security); the mask is only
+    # built when INFO records will actually be emitted
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Verifying API key: %s", _mask(api_key))
+    
+    # Keys that were never issued are rejected without touching Redis or MongoDB
+    key_filter = _key_filter
+    if key_filter is not None and hashlib.sha256(api_key.encode()).digest() not in key_filter:
+        return _error(_ERR_NOTFOUND)
+    
+    # Serve repeated keys from the cache
+    cached = _cache_get(api_key)
+    if cached is not _MISS:
+        if cached is None:
+            return _error(_ERR_NOTFOUND)
+        email, name, company = cached
+        return _json({"valid": True, "email": email, "name": name, "company": company})
+    
+    # Check if MongoDB is available
+    collection = get_collection(raw=True)
+    if collection is None:
+        logger.warning("MongoDB not available for API key verification")
+        return _error(_ERR_NODB)
+    
+    # Only the database call is guarded; anything else is a bug and surfaces as a 500
     try:
-        # Get API key from query parameters
-        api_key = request.args.get('api_key')
-        
-        # Log the request (without the full API key for security)
-        if api_key:
-            masked_key = api_key[:8] + "..." + api_key[-4:] if len(api_key) > 12 else "***"
-            logger.info(f"Verifying API key: {masked_key}")
-        else:
-            logger.info("API key verification requested but no key provided")
-        
-        # Validate API key format
-        if not api_key:
-            return jsonify({"valid": False, "reason": "API key not provided"}), 400
-        
-        if not isinstance(api_key, str) or len(api_key) < 10:
-            return jsonify({"valid": False, "reason": "Invalid API key format"}), 400
-        
-        # Check if MongoDB is available
-        if api_keys_collection is None:
+        record = _find_user(collection, api_key)
+    except PyMongoError:
+        logger.exception("Database query failed in verify_key")
+        return _error(_ERR_DBQUERY)
+    
+    if not record:
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("API key not found in database: %s", _mask(api_key))
+        _cache_set(api_key, None)
+        return _error(_ERR_NOTFOUND)
+    
+    # Older documents may lack some fields; they are reported as empty strings, as before
+    email, name, company = record.get("email", ""), record.get("name", ""), record.get("company", "")
+    logger.info("API key verified successfully for user: %s", email or "unknown")
+    _cache_set(api_key, (email, name, company))
+    return _json({"valid": True, "email": email, "name": name, "company": company})
+
+@api_verification_bp.route('/verify_keys', methods=['POST'])
+def verify_keys():
+    """Verify a batch of API keys with a single database round-trip"""
+    data = request.get_json(silent=True) or {}
+    api_keys = data.get('api_keys')
+    
+    if not isinstance(api_keys, list) or not api_keys:
+        return _json({"valid": False, "reason": "api_keys must be a non-empty list"}, 400)
+    
+    if len(api_keys) > MAX_BATCH_KEYS:
+        return _json({"valid": False, "reason": f"At most {MAX_BATCH_KEYS} API keys per request"}, 400)
+    
+    # De-duplicate well-formed keys and serve what we can from the cache
+    well_formed = list(dict.fromkeys(k for k in api_keys if isinstance(k, str) and len(k) >= 10))
+    entries = {}
+    key_filter = _key_filter
+    if key_filter is not None:
+        entries = {k: None for k in well_formed if hashlib.sha256(k.encode()).digest() not in key_filter}
+        well_formed = [k for k in well_formed if k not in entries]
+    entries.update(_cache_get_many(well_formed))
+    pending = [k for k in well_formed if k not in entries]
+    
+    if pending:
+        collection = get_collection()
+        if collection is None:
             logger.warning("MongoDB not available for API key verification")
-            return jsonify({"valid": False, "reason": "Database connection not available. Please configure MongoDB."}), 500
+            return _error(_ERR_NODB)
         
-        # Query database with timeout and error handling
         try:
-            record = api_keys_collection.find_one(
-                {"apiKey": api_key}, 
-                {"email": 1, "name": 1, "company": 1, "_id": 0}
-            )
-            
+            records = _find_users(collection, pending)
+        except PyMongoError:
+            logger.exception("Database query failed in verify_keys")
+            return _error(_ERR_DBQUERY)
+        
+        fetched = {}
+        for api_key in pending:
+            record = records.get(api_key)
             if record:
-                logger.info(f"API key verified successfully for user: {record.get('email', 'unknown')}")
-                return jsonify({
-                    "valid": True, 
-                    "email": record.get("email", ""),
-                    "name": record.get("name", ""),
-                    "company": record.get("company", "")
-                })
+                fetched[api_key] = (record.get("email", ""), record.get("name", ""), record.get("company", ""))
             else:
-                logger.warning(f"API key not found in database: {masked_key}")
-                return jsonify({"valid": False, "reason": "API key not found"}), 404
-                
-        except Exception as db_error:
-            logger.error(f"Database query error: {db_error}")
-            return jsonify({"valid": False, "reason": "Database query failed"}), 500
-            
-    except Exception as e:
-        logger.error(f"Unexpected error in verify_key: {str(e)}")
-        return jsonify({"valid": False, "reason": "Internal server error"}), 500
+                fetched[api_key] = None
+        _cache_set_many(fetched)
+        entries.update(fetched)
+    
+    # Results are returned in the same order as the requested keys
+    results = []
+    for api_key in api_keys:
+        if not isinstance(api_key, str) or len(api_key) < 10:
+            results.append({"valid": False, "reason": "Invalid API key format"})
+        elif entries[api_key] is None:
+            results.append({"valid": False, "reason": "API key not found"})
+        else:
+            email, name, company = entries[api_key]
+            results.append({"valid": True, "email": email, "name": name, "company": company})
+    
+    # Charged by charge_failed_lookup, like a failed verify_key per key
+    g.failed_lookups = sum(1 for result in results if not result["valid"])
+    
+    return _json({"results": results})
+
+def _ping_mongo():
+    """Return the cached MongoDB ping result, refreshing it at most every HEALTH_PING_INTERVAL"""
+    now = time.monotonic()
+    if now - _last_ping[0] > HEALTH_PING_INTERVAL:
+        try:
+            client.admin.command('ping')
+            _last_ping[:] = [now, True]
+        except Exception as e:
+            logger.warning(f"MongoDB health ping failed: {e}")
+            _last_ping[:] = [now, False]
+    return _last_ping[1]
 
 @api_verification_bp.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint for the verification service"""
     try:
+        collection = get_collection()
         status = {
             "service": "api_verification",
             "status": "healthy",
-            "mongodb_connected": api_keys_collection is not None
+            "mongodb_connected": collection is not None
         }
         
-        if api_keys_collection is not None:
-            # Test database connection
-            try:
-                api_keys_collection.find_one()
-                status["database_status"] = "connected"
-            except Exception as e:
-                status["database_status"] = "error"
-                status["database_error"] = str(e)
+        if client is not None:
+            status["mongodb_pool"] = {
+                "max_pool_size": client.options.pool_options.max_pool_size,
+                "min_pool_size": client.options.pool_options.min_pool_size,
+                "topology": client.topology_description.topology_type_name
+            }
+        
+        with _cache_lock:
+            status["key_cache"] = {
+                "hits": _cache_stats["hits"],
+                "misses": _cache_stats["misses"],
+                "size": len(_key_cache),
+                "negative_size": len(_negative_cache),
+                "redis_connected": redis_client is not None
+            }
+        
+        key_filter = _key_filter
+        status["key_filter"] = {
+            "enabled": key_filter is not None,
+            "keys": key_filter.count if key_filter is not None else 0,
+            "built_at": _key_filter_built_at,
+            "watching": _key_filter_watching
+        }
+        
+        if collection is not None:
+            status["database_status"] = "connected" if _ping_mongo() else "error"
         else:
             status["database_status"] = "not_configured"
             
-        return jsonify(status), 200
+        return _json(status, 200)
         
-    except Exception as e:
-        logger.error(f"Health check error: {e}")
-        return jsonify({
-            "service": "api_verification",
-            "status": "unhealthy",
-            "error": str(e)
-        }), 500 
\ No newline at end of file
+    except Exception:
+        logger.exception("Health check failed")
+        return _error(_ERR_UNHEALTHY)
@@ -4,22 +4,38 @@ Flask API for Ethical AI Governance Toolkit
 Provides REST endpoints to run badge generation, dataset fingerprinting, and bias analysis
 """
 
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, request, send_from_directory
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import os
 import json
+import orjson
 import tempfile
+import gzip
+import mmap
 import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 import pandas as pd
 import numpy as np
 from werkzeug.utils import secure_filename
-import hashlib
-import base64
+from werkzeug.exceptions import NotFound, RequestEntityTooLarge
+import secrets
+import re
+# pybase64 is a SIMD-accelerated drop-in for the stdlib module
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
 from io import BytesIO
+from urllib.parse import quote
 import matplotlib
 matplotlib.use('Agg')  # Use non-interactive backend
+# Render long line paths in chunks so large datasets don't blow up the Agg renderer
+matplotlib.rcParams['agg.path.chunksize'] = 10000
 import matplotlib.pyplot as plt
 import seaborn as sns
 from PIL import Image
@@ -39,8 +55,8 @@ sys.path.insert(0, parent_dir)
 
 # Import from existing modules
 try:
-    from badge_generator.ethical_badge_generator import EthicalBadgeGenerator
-    from cli_toolkit.generate_fingerprint import DatasetFingerprinter
+    from badge_generator.ethical_badge_generator import DEFAULT_GENERATOR
+    from cli_toolkit.generate_fingerprint import DatasetFingerprinter, StreamingFileHasher, GENERATOR_VERSION
     from cli_toolkit.analyze_bias import BiasAnalyzer
     from api_verification import api_verification_bp
     print("✅ Successfully imported all modules")
@@ -51,15 +67,51 @@ except ImportError as e:
     print(f"Python path: {sys.path}")
     print("Please ensure the modules are available in cli_toolkit and badge_generator folders")
 
+# One badge generator per process; its templates never change and its fonts load once
+try:
+    badge_generator = DEFAULT_GENERATOR
+except NameError:
+    badge_generator = None
+badge_lock = threading.Lock()
+
 app = Flask(__name__)
 CORS(app)  # Enable CORS for frontend access
 app.register_blueprint(api_verification_bp)
 
 # Configuration
 app.config['MAX_CONTENT_LENGTH'] = 100 * 1024 * 1024  # 100MB max file size
-app.config['UPLOAD_FOLDER'] = 'uploads'
-app.config['RESULTS_FOLDER'] = 'results'
+# Absolute paths so results resolve the same way regardless of the server's working directory
+app.config['UPLOAD_FOLDER'] = os.path.join(current_dir, 'uploads')
+app.config['RESULTS_FOLDER'] = os.path.join(current_dir, 'results')
 app.config['ALLOWED_EXTENSIONS'] = {'csv', 'xlsx', 'xls', 'json', 'parquet'}
+app.config['UPLOAD_CHUNK_SIZE'] = 1024 * 1024  # 1MB copy buffer when writing uploads
+
+# Parsed copy of a session's dataset, kept next to the upload so later analyses skip re-parsing
+DATASET_CACHE_NAME = '.cache.feather'
+
+# Per-session upload metadata, so endpoints find the dataset without listing the folder
+SESSION_META_NAME = '_session.json'
+
+# Fingerprints memoized by dataset file id (BLAKE3 or SHA-256), shared by sessions that upload identical files.
+# Kept outside RESULTS_FOLDER so no session route can list, download or delete it
+HASH_CACHE_FOLDER = os.path.join(current_dir, 'cache', 'fingerprints')
+
+# Bias analysis only counts duplicate rows above this size when the request asks for it
+DUPLICATE_CHECK_MAX_ROWS = 1_000_000
+
+# Badge files the generate endpoint can write (all by default)
+BADGE_FORMATS = ('png', 'svg', 'json')
+
+# Resolution of the bias plots served to the frontend (the CLI keeps 300 DPI)
+PLOT_DPI = 100
+
+# Threads used to run the independent BiasAnalyzer passes side by side
+BIAS_ANALYSIS_WORKERS = 4
+
+# gzip JSON/text responses at least this large when the client accepts it
+COMPRESS_MIMETYPES = frozenset({'application/json', 'text/plain'})
+COMPRESS_MIN_SIZE = 1024
+COMPRESS_LEVEL = 6
 
 # Create necessary directories
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
@@ -70,14 +122,184 @@ def allowed_file(filename):
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in app.config['ALLOWED_EXTENSIONS']
 
+# numpy arrays/scalars are serialized natively; DataFrames, Series and other
+# numpy-like objects go through _json_default
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+def _json_default(obj):
+    """Convert pandas/numpy types orjson does not handle natively"""
+    if hasattr(obj, 'to_dict'):
+        return obj.to_dict()
+    if hasattr(obj, 'item'):
+        return obj.item()
+    return str(obj)
+
+def fast_jsonify(obj, status=200):
+    """Serialize a response body with orjson, handling pandas/numpy values in one pass"""
+    return app.response_class(orjson.dumps(obj, default=_json_default, option=ORJSON_OPTIONS),
+                              status=status, mimetype='application/json')
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Route Flask's own JSON handling (request.get_json, jsonify, error bodies) through orjson"""
+    
+    # Keep insertion order, matching fast_jsonify
+    sort_keys = False
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=_json_default, option=ORJSON_OPTIONS).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+app.json_provider_class = OrjsonProvider
+app.json = OrjsonProvider(app)
+
+def read_excel_fast(file_path, **kwargs):
+    """Read an Excel sheet with python-calamine when installed, else openpyxl in read-only mode"""
+    # calamine needs pandas >= 2.2 and the optional python-calamine package
+    try:
+        return pd.read_excel(file_path, engine='calamine', **kwargs)
+    except (ImportError, ValueError):
+        pass
+    # pandas opens openpyxl workbooks read_only/data_only, streaming rows instead of
+    # building the full cell model; legacy .xls still needs xlrd
+    engine = 'openpyxl' if file_path.lower().endswith('.xlsx') else None
+    return pd.read_excel(file_path, engine=engine, **kwargs)
+
+def read_dataset(file_path):
+    """Load a dataset with the fastest available pandas engine for its format"""
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext == '.csv':
+        # pyarrow's CSV reader is multithreaded; fall back to the C engine if it is
+        # missing or rejects the file
+        try:
+            return pd.read_csv(file_path, engine='pyarrow')
+        except (ImportError, ValueError):
+            return pd.read_csv(file_path)
+    if ext == '.parquet':
+        return pd.read_parquet(file_path, engine='pyarrow')
+    if ext in ('.xlsx', '.xls'):
+        return read_excel_fast(file_path)
+    if ext == '.json':
+        return pd.read_json(file_path)
+    raise ValueError(f"Unsupported file format: {ext}")
+
+def load_dataset_cached(session_folder, dataset_file):
+    """Load a session's dataset, reusing a Feather copy written by the first parse"""
+    cache_path = os.path.join(session_folder, DATASET_CACHE_NAME)
+    if os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(dataset_file):
+        try:
+            return pd.read_feather(cache_path)
+        except Exception as e:
+            print(f"⚠️ Ignoring unreadable dataset cache: {str(e)}")
+    
+    df = read_dataset(dataset_file)
+    try:
+        df.to_feather(cache_path, compression='lz4')
+    except Exception as e:
+        # Feather needs pyarrow and string column names; the parse still succeeded
+        print(f"⚠️ Could not cache dataset as Feather: {str(e)}")
+    return df
+
+def read_cached_fingerprint(file_id):
+    """Return the memoized fingerprint for a dataset file id, or None on a miss"""
+    try:
+        with open(os.path.join(HASH_CACHE_FOLDER, f"{file_id}.json"), 'rb') as f:
+            fingerprint_data = orjson.loads(f.read())
+    except (OSError, ValueError):
+        return None
+    # Fingerprints from an older generator may hash content differently
+    if fingerprint_data.get('fingerprint_info', {}).get('generator_version') != GENERATOR_VERSION:
+        return None
+    return fingerprint_data
+
+def write_cached_fingerprint(file_id, fingerprint_data):
+    """Memoize a fingerprint under its dataset file id; os.replace keeps readers off partial files"""
+    os.makedirs(HASH_CACHE_FOLDER, exist_ok=True)
+    cache_path = os.path.join(HASH_CACHE_FOLDER, f"{file_id}.json")
+    tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(orjson.dumps(fingerprint_data, default=_json_default, option=ORJSON_OPTIONS))
+    os.replace(tmp_path, cache_path)
+
+def is_internal_file(filename):
+    """Whether a session-folder entry is bookkeeping rather than user data"""
+    return filename.startswith('.') or filename == SESSION_META_NAME
+
+def write_session_meta(session_folder, meta):
+    """Record upload metadata (dataset filename etc.) for later requests in the session"""
+    with open(os.path.join(session_folder, SESSION_META_NAME), 'w') as f:
+        json.dump(meta, f)
+
+def read_session_meta(session_folder):
+    """Return the session's upload metadata, or {} for sessions created before it existed"""
+    try:
+        with open(os.path.join(session_folder, SESSION_META_NAME), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def find_dataset_file(session_folder):
+    """Return the uploaded dataset in a session folder"""
+    filename = read_session_meta(session_folder).get('file')
+    if filename:
+        return os.path.join(session_folder, filename)
+    
+    # Older sessions have no metadata; take the first regular data file
+    with os.scandir(session_folder) as entries:
+        for entry in entries:
+            if entry.is_file() and not is_internal_file(entry.name):
+                return entry.path
+    return None
+
+def remove_folder_in_background(folder):
+    """Detach a folder with an atomic rename, then delete it on a daemon thread"""
+    # Once renamed the session is unreachable, so the request need not wait for rmtree
+    doomed = f"{folder}.deleting-{secrets.token_hex(4)}"
+    os.rename(folder, doomed)
+    threading.Thread(target=shutil.rmtree, args=(doomed,), kwargs={'ignore_errors': True},
+                     daemon=True).start()
+
+@contextmanager
+def atomic_text_file(path):
+    """Write path through a temp file that replaces it on success and is removed on any failure"""
+    tmp_path = f"{path}.{secrets.token_hex(4)}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        # Never leave a half-written file where the session listing and downloads can see it
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def read_text_mapped(file_path):
+    """Decode a UTF-8 text file straight from a read-only memory map, skipping a bytes copy"""
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ''
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return str(mapped, 'utf-8')
+
+def result_url(session_id, filename):
+    """URL at which a generated result file is served"""
+    return f"/api/result/{quote(session_id)}/{quote(filename)}"
+
+def embed_images_requested():
+    """Whether the caller asked for images inlined as base64 (?embed=1)"""
+    return request.args.get('embed') in ('1', 'true')
+
 def generate_session_id():
     """Generate unique session ID for file management"""
-    return hashlib.md5(str(datetime.now()).encode()).hexdigest()[:16]
+    return secrets.token_hex(8)
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({
+    return fast_jsonify({
         'status': 'healthy',
         'timestamp': datetime.now().isoformat(),
         'services': {
@@ -92,14 +314,14 @@ def upload_file():
     """Upload dataset file and return session info"""
     try:
         if 'file' not in request.files:
-            return jsonify({'error': 'No file provided'}), 400
+            return fast_jsonify({'error': 'No file provided'}, 400)
         
         file = request.files['file']
         if file.filename == '':
-            return jsonify({'error': 'No file selected'}), 400
+            return fast_jsonify({'error': 'No file selected'}, 400)
         
         if not allowed_file(file.filename):
-            return jsonify({'error': 'File type not allowed'}), 400
+            return fast_jsonify({'error': 'File type not allowed'}, 400)
         
         # Generate session ID and create session folder
         session_id = generate_session_id()
@@ -108,13 +330,29 @@ def upload_file():
         
         # Save file
         filename = secure_filename(file.filename) if file.filename else 'uploaded_file'
+        if not filename or is_internal_file(filename):
+            filename = f"uploaded_{filename}"
         file_path = os.path.join(session_folder, filename)
-        file.save(file_path)
+        # Stream the upload to disk in large chunks rather than Werkzeug's 16KB default,
+        # hashing each chunk on the way so fingerprinting never re-reads the file
+        hasher = StreamingFileHasher()
+        chunk_size = app.config['UPLOAD_CHUNK_SIZE']
+        file.stream.seek(0)
+        with open(file_path, 'wb') as out:
+            for chunk in iter(lambda: file.stream.read(chunk_size), b''):
+                hasher.update(chunk)
+                out.write(chunk)
         
         # Get basic file info
         file_stats = os.stat(file_path)
+        write_session_meta(session_folder, {
+            'file': filename,
+            'size': file_stats.st_size,
+            'sha256': hasher.file_hash(),
+            'file_id': hasher.file_id()
+        })
         
-        return jsonify({
+        return fast_jsonify({
             'success': True,
             'session_id': session_id,
             'filename': filename,
@@ -123,8 +361,11 @@ def upload_file():
             'upload_time': datetime.fromtimestamp(file_stats.st_ctime).isoformat()
         })
         
+    except RequestEntityTooLarge:
+        # Flask enforces MAX_CONTENT_LENGTH while parsing the form; the 413 handler answers
+        raise
     except Exception as e:
-        return jsonify({'error': f'Upload failed: {str(e)}'}), 500
+        return fast_jsonify({'error': f'Upload failed: {str(e)}'}, 500)
 
 @app.route('/api/badge/generate', methods=['POST'])
 def generate_badge():
@@ -133,12 +374,12 @@ def generate_badge():
         data = request.get_json()
         
         if not data:
-            return jsonify({'error': 'No data provided'}), 400
+            return fast_jsonify({'error': 'No data provided'}, 400)
         
         required_fields = ['model_name', 'category_scores']
         for field in required_fields:
             if field not in data:
-                return jsonify({'error': f'Missing required field: {field}'}), 400
+                return fast_jsonify({'error': f'Missing required field: {field}'}, 400)
         
         model_name = data['model_name']
         category_scores = data['category_scores']
@@ -156,62 +397,52 @@ def generate_badge():
         
         for category in required_categories:
             if category not in category_scores:
-                return jsonify({'error': f'Missing score for category: {category}'}), 400
+                return fast_jsonify({'error': f'Missing score for category: {category}'}, 400)
             
             score = category_scores[category]
             if not isinstance(score, (int, float)) or not (0 <= score <= 100):
-                return jsonify({'error': f'Invalid score for {category}: must be 0-100'}), 400
-        
-        # Generate badge
-        print("Creating EthicalBadgeGenerator instance...")
-        generator = EthicalBadgeGenerator()
+                return fast_jsonify({'error': f'Invalid score for {category}: must be 0-100'}, 400)
         
-        print("Generating badge data...")
-        badge_data = generator.generate_badge_data(model_name, category_scores, threshold, overall_score)
+        # ?format=json (repeatable) limits the files written; verdict-only callers skip rendering
+        formats = request.args.getlist('format') or list(BADGE_FORMATS)
+        for fmt in formats:
+            if fmt not in BADGE_FORMATS:
+                return fast_jsonify({'error': f'Invalid format: {fmt}'}, 400)
         
         # Create session folder for results
         session_id = generate_session_id()
         results_folder = os.path.join(app.config['RESULTS_FOLDER'], session_id)
         os.makedirs(results_folder, exist_ok=True)
         
-        print(f"Saving badge to: {results_folder}")
-        # Save badge files
-        saved_files = generator.save_badge(badge_data, results_folder, 
-                                         formats=['png', 'svg', 'json'])
+        # Generate badge with the shared generator; PIL font objects are not
+        # safe to render from several threads at once
+        with badge_lock:
+            print("Generating badge data...")
+            badge_data = badge_generator.generate_badge_data(model_name, category_scores, threshold, overall_score)
+            
+            print(f"Saving badge to: {results_folder}")
+            # Save badge files
+            saved_files = badge_generator.save_badge(badge_data, results_folder, formats=formats)
         
-        # Convert PNG to base64 for frontend display
+        # The frontend loads the PNG from /api/result; ?embed=1 also inlines it as base64
         png_file = next((f for f in saved_files if f.endswith('.png')), None)
+        badge_image_url = None
         badge_image_base64 = None
         if png_file:
-            with open(png_file, 'rb') as img_file:
-                badge_image_base64 = base64.b64encode(img_file.read()).decode('utf-8')
+            badge_image_url = result_url(session_id, os.path.basename(png_file))
+            if embed_images_requested():
+                with open(png_file, 'rb') as img_file:
+                    badge_image_base64 = base64.b64encode(img_file.read()).decode('utf-8')
         
         # Prepare response
         print("✅ Badge generation completed successfully")
         
-        # Convert pandas/numpy types to native Python types for JSON serialization
-        def convert_to_serializable(obj):
-            if hasattr(obj, 'to_dict'):
-                return obj.to_dict()
-            elif hasattr(obj, 'item'):
-                return obj.item()
-            elif isinstance(obj, dict):
-                return {k: convert_to_serializable(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [convert_to_serializable(v) for v in obj]
-            elif hasattr(obj, 'dtype'):  # numpy/pandas types
-                return obj.item() if hasattr(obj, 'item') else str(obj)
-            else:
-                return obj
-        
-        # Convert badge data to JSON-serializable format
-        serializable_badge_data = convert_to_serializable(badge_data)
-        
-        return jsonify({
+        return fast_jsonify({
             'success': True,
             'session_id': session_id,
-            'badge_data': serializable_badge_data,
+            'badge_data': badge_data,
             'badge_image': badge_image_base64,
+            'badge_image_url': badge_image_url,
             'files': saved_files,
             'summary': {
                 'model_name': badge_data['model_name'],
@@ -226,7 +457,7 @@ def generate_badge():
         import traceback
         print(f"❌ Badge generation failed: {str(e)}")
         print(f"Traceback: {traceback.format_exc()}")
-        return jsonify({'error': f'Badge generation failed: {str(e)}'}), 500
+        return fast_jsonify({'error': f'Badge generation failed: {str(e)}'}, 500)
 
 @app.route('/api/fingerprint/generate', methods=['POST'])
 def generate_fingerprint():
@@ -235,7 +466,7 @@ def generate_fingerprint():
         data = request.get_json()
         
         if not data or 'session_id' not in data:
-            return jsonify({'error': 'Session ID required'}), 400
+            return fast_jsonify({'error': 'Session ID required'}, 400)
         
         session_id = data['session_id']
         session_folder = os.path.join(app.config['UPLOAD_FOLDER'], session_id)
@@ -244,25 +475,41 @@ def generate_fingerprint():
         print(f"Session folder: {session_folder}")
         
         if not os.path.exists(session_folder):
-            return jsonify({'error': 'Invalid session ID'}), 400
+            return fast_jsonify({'error': 'Invalid session ID'}, 400)
         
         # Find the dataset file
-        files = os.listdir(session_folder)
-        if not files:
-            return jsonify({'error': 'No dataset file found'}), 400
+        dataset_file = find_dataset_file(session_folder)
+        if not dataset_file:
+            return fast_jsonify({'error': 'No dataset file found'}, 400)
         
-        dataset_file = os.path.join(session_folder, files[0])
         print(f"Dataset file: {dataset_file}")
         
         # Generate fingerprint using existing class
         print("Creating DatasetFingerprinter instance...")
         fingerprinter = DatasetFingerprinter(dataset_file)
-        
-        print("Loading dataset...")
-        fingerprinter.load_dataset()
-        
-        print("Generating fingerprint...")
-        fingerprint_data = fingerprinter.generate_fingerprint()
+        # Hashes computed while the file was uploaded (absent for older sessions)
+        session_meta = read_session_meta(session_folder)
+        fingerprinter.file_hash = session_meta.get('sha256')
+        fingerprinter.file_id = session_meta.get('file_id')
+        
+        # The fingerprint depends only on the file's bytes, so identical uploads reuse it
+        file_id = fingerprinter.generate_file_id()
+        fingerprint_data = read_cached_fingerprint(file_id)
+        if fingerprint_data is not None:
+            print("✅ Reusing cached fingerprint for identical dataset")
+            # File details still describe this session's upload
+            fingerprint_data['file_info'] = fingerprinter.file_info()
+            fingerprinter.fingerprint_data = fingerprint_data
+        else:
+            print("Loading dataset...")
+            fingerprinter.df = load_dataset_cached(session_folder, dataset_file)
+            
+            print("Generating fingerprint...")
+            fingerprint_data = fingerprinter.generate_fingerprint()
+            try:
+                write_cached_fingerprint(file_id, fingerprint_data)
+            except Exception as e:
+                print(f"⚠️ Could not cache fingerprint: {str(e)}")
         
         # Create results folder
         results_folder = os.path.join(app.config['RESULTS_FOLDER'], session_id)
@@ -276,7 +523,7 @@ def generate_fingerprint():
         # Generate printable report
         report_content = fingerprinter.generate_printable_report()
         report_path = os.path.join(results_folder, 'fingerprint_report.txt')
-        with open(report_path, 'w') as f:
+        with open(report_path, 'w', encoding='utf-8') as f:
             f.write(report_content)
         
         # Prepare summary for frontend
@@ -293,28 +540,10 @@ def generate_fingerprint():
         
         print("✅ Fingerprint generation completed successfully")
         
-        # Convert pandas/numpy types to native Python types for JSON serialization
-        def convert_to_serializable(obj):
-            if hasattr(obj, 'to_dict'):
-                return obj.to_dict()
-            elif hasattr(obj, 'item'):
-                return obj.item()
-            elif isinstance(obj, dict):
-                return {k: convert_to_serializable(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [convert_to_serializable(v) for v in obj]
-            elif hasattr(obj, 'dtype'):  # numpy/pandas types
-                return obj.item() if hasattr(obj, 'item') else str(obj)
-            else:
-                return obj
-        
-        # Convert fingerprint data to JSON-serializable format
-        serializable_fingerprint_data = convert_to_serializable(fingerprint_data)
-        
-        return jsonify({
+        return fast_jsonify({
             'success': True,
             'session_id': session_id,
-            'fingerprint_data': serializable_fingerprint_data,
+            'fingerprint_data': fingerprint_data,
             'report_content': report_content,
             'summary': summary,
             'files': [json_path, report_path]
@@ -324,7 +553,7 @@ def generate_fingerprint():
         import traceback
         print(f"❌ Fingerprint generation failed: {str(e)}")
         print(f"Traceback: {traceback.format_exc()}")
-        return jsonify({'error': f'Fingerprint generation failed: {str(e)}'}), 500
+        return fast_jsonify({'error': f'Fingerprint generation failed: {str(e)}'}, 500)
 
 @app.route('/api/bias/analyze', methods=['POST'])
 def analyze_bias():
@@ -333,11 +562,12 @@ def analyze_bias():
         data = request.get_json()
         
         if not data or 'session_id' not in data:
-            return jsonify({'error': 'Session ID required'}), 400
+            return fast_jsonify({'error': 'Session ID required'}, 400)
         
         session_id = data['session_id']
         protected_attributes = data.get('protected_attributes', [])
         target_column = data.get('target_column')
+        check_duplicates = bool(data.get('check_duplicates', False))
         
         session_folder = os.path.join(app.config['UPLOAD_FOLDER'], session_id)
         
@@ -347,24 +577,22 @@ def analyze_bias():
         print(f"Target column: {target_column}")
         
         if not os.path.exists(session_folder):
-            return jsonify({'error': 'Invalid session ID'}), 400
+            return fast_jsonify({'error': 'Invalid session ID'}, 400)
         
         # Find the dataset file
-        files = os.listdir(session_folder)
-        if not files:
-            return jsonify({'error': 'No dataset file found'}), 400
+        dataset_file = find_dataset_file(session_folder)
+        if not dataset_file:
+            return fast_jsonify({'error': 'No dataset file found'}, 400)
         
-        dataset_file = os.path.join(session_folder, files[0])
         print(f"Dataset file: {dataset_file}")
         
         # Load dataset
         print("Loading dataset...")
-        if dataset_file.endswith('.csv'):
-            df = pd.read_csv(dataset_file)
-        elif dataset_file.endswith(('.xlsx', '.xls')):
-            df = pd.read_excel(dataset_file)
-        else:
-            return jsonify({'error': 'Unsupported file format for bias analysis'}), 400
+        if not dataset_file.endswith(('.csv', '.xlsx', '.xls', '.parquet')):
+            return fast_jsonify({'error': 'Unsupported file format for bias analysis'}, 400)
+        # The whole frame is loaded: shape, missing values, duplicates, imbalance and the
+        # bias score all describe the dataset, not just the analyzed columns
+        df = load_dataset_cached(session_folder, dataset_file)
         
         print(f"Dataset loaded: {df.shape[0]} rows, {df.shape[1]} columns")
         
@@ -389,59 +617,77 @@ def analyze_bias():
         
         print(f"Results folder: {results_folder}")
         
-        # Change to results directory for plot saving
-        original_dir = os.getcwd()
-        os.chdir(results_folder)
-        
-        try:
-            print("Running bias analysis...")
-            # Run analysis using existing methods
-            basic_stats = analyzer.basic_statistics()
+        print("Running bias analysis...")
+        # The four passes only read analyzer.df and each writes its own bias_report key,
+        # so they run concurrently; pandas releases the GIL inside its C loops
+        with ThreadPoolExecutor(max_workers=BIAS_ANALYSIS_WORKERS) as executor:
+            basic_stats_future = executor.submit(analyzer.basic_statistics)
+            missing_stats_future = executor.submit(analyzer.missing_values_analysis)
+            imbalance_future = executor.submit(analyzer.detect_class_imbalance)
+            protected_future = executor.submit(analyzer.protected_attribute_analysis)
+            
+            basic_stats = basic_stats_future.result()
             print("Basic statistics completed")
             
-            missing_stats = analyzer.missing_values_analysis()
+            missing_stats = missing_stats_future.result()
             print("Missing values analysis completed")
             
-            imbalance_data = analyzer.detect_class_imbalance()
+            imbalance_data = imbalance_future.result()
             print("Class imbalance detection completed")
             
-            analyzer.protected_attribute_analysis()
+            protected_future.result()
             print("Protected attribute analysis completed")
-            
-            # Generate visualizations
-            print("Generating visualizations...")
-            analyzer.create_bias_visualizations()
-            print("Visualizations completed")
-            
-            # Generate bias report
-            print("Generating bias report...")
-            bias_report = analyzer.generate_bias_report()
-            print("Bias report completed")
-            
-            # Get bias score and reasoning
-            bias_analysis = analyzer.bias_report.get('bias_score_analysis', {})
-            
-        finally:
-            os.chdir(original_dir)
         
-        # Convert visualizations to base64
+        # Generate visualizations
+        print("Generating visualizations...")
+        analyzer.create_bias_visualizations(out_dir=results_folder, dpi=PLOT_DPI)
+        print("Visualizations completed")
+        
+        # Generate bias report while the plot PNGs are still being written
+        print("Generating bias report...")
+        bias_report = analyzer.generate_bias_report()
+        print("Bias report completed")
+        
+        analyzer.wait_for_visualizations()
+        
+        # Get bias score and reasoning
+        bias_analysis = analyzer.bias_report.get('bias_score_analysis', {})
+        
+        # Reference visualizations by URL; ?embed=1 also inlines them as base64
         plot_files = ['bias_analysis_report.png', 'correlation_heatmap.png']
         plot_images = {}
+        plot_urls = {}
+        embed_images = embed_images_requested()
         
         for plot_file in plot_files:
             plot_path = os.path.join(results_folder, plot_file)
             if os.path.exists(plot_path):
-                with open(plot_path, 'rb') as img_file:
-                    plot_images[plot_file] = base64.b64encode(img_file.read()).decode('utf-8')
+                plot_urls[plot_file] = result_url(session_id, plot_file)
+                if embed_images:
+                    with open(plot_path, 'rb') as img_file:
+                        plot_images[plot_file] = base64.b64encode(img_file.read()).decode('utf-8')
+        
+        # Reuse the per-column counts from missing_values_analysis instead of rescanning df
+        total_cells = df.shape[0] * df.shape[1]
+        total_missing = int(missing_stats['Missing_Count'].sum())
+        total_missing_percentage = float(total_missing / total_cells * 100) if total_cells else 0.0
+        
+        # Hashing every row is skipped on very large frames unless explicitly requested
+        if check_duplicates or df.shape[0] <= DUPLICATE_CHECK_MAX_ROWS:
+            duplicate_rows = int(df.duplicated().sum())  # Convert to native int
+        else:
+            duplicate_rows = None
         
         # Prepare summary
+        # One timestamp for the summary and the saved results
+        analysis_timestamp = datetime.now().isoformat()
         summary = {
             'dataset_shape': [int(df.shape[0]), int(df.shape[1])],  # Convert tuple to list of ints
             'target_column': target_column,
             'protected_attributes': protected_attributes,
-            'total_missing_percentage': float((df.isnull().sum().sum() / (df.shape[0] * df.shape[1])) * 100),
-            'duplicate_rows': int(df.duplicated().sum()),  # Convert to native int
-            'analysis_timestamp': datetime.now().isoformat(),
+            'total_missing_percentage': total_missing_percentage,
+            'duplicate_rows': duplicate_rows,
+            'analysis_timestamp': analysis_timestamp,
             'bias_score': bias_analysis.get('bias_score', 0),
             'bias_level': bias_analysis.get('bias_level', 'UNKNOWN'),
             'bias_reasoning': bias_analysis.get('reasoning', [])
@@ -457,7 +703,7 @@ def analyze_bias():
             if severe_imbalances > 0:
                 risk_factors.append(f"{severe_imbalances} severely imbalanced features")
         
-        # Simple check for high missing values - will be handled by convert_to_serializable later
+        # Simple check for high missing values
         if hasattr(missing_stats, 'get') and 'Missing_Percentage' in missing_stats:
             high_missing = sum(1 for pct in missing_stats['Missing_Percentage'] if pct > 20)
             if high_missing > 0:
@@ -470,121 +716,116 @@ def analyze_bias():
         
         print("✅ Bias analysis completed successfully")
         
-        # Convert pandas/numpy types to native Python types for JSON serialization
-        def convert_to_serializable(obj):
-            if hasattr(obj, 'to_dict'):
-                return obj.to_dict()
-            elif hasattr(obj, 'item'):
-                return obj.item()
-            elif isinstance(obj, dict):
-                return {k: convert_to_serializable(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [convert_to_serializable(v) for v in obj]
-            elif hasattr(obj, 'dtype'):  # numpy/pandas types
-                return obj.item() if hasattr(obj, 'item') else str(obj)
-            else:
-                return obj
-        
-        # Convert all data to JSON-serializable format
-        serializable_basic_stats = convert_to_serializable(basic_stats)
-        serializable_missing_stats = convert_to_serializable(missing_stats)
-        serializable_imbalance_data = convert_to_serializable(imbalance_data)
-        serializable_summary = convert_to_serializable(summary)
-        serializable_bias_analysis = convert_to_serializable(bias_analysis)
-        
-        # Save bias analysis results to JSON file for comprehensive report
+        # Save bias analysis results for the comprehensive report. The tabular sections go
+        # to Parquet next to a compact JSON summary; without pyarrow they stay in the JSON.
         bias_results = {
             'session_id': session_id,
-            'timestamp': datetime.now().isoformat(),
-            'summary': serializable_summary,
-            'bias_score_analysis': serializable_bias_analysis,
-            'basic_statistics': serializable_basic_stats,
-            'missing_values': serializable_missing_stats,
-            'class_imbalance': serializable_imbalance_data
+            'timestamp': analysis_timestamp,
+            'summary': summary,
+            'bias_score_analysis': bias_analysis,
+            'class_imbalance': imbalance_data
         }
         
+        for section, table in (('basic_statistics', basic_stats), ('missing_values', missing_stats)):
+            table_file = os.path.join(results_folder, f'{section}.parquet')
+            try:
+                table.to_parquet(table_file, compression='zstd')
+                bias_results[f'{section}_file'] = os.path.basename(table_file)
+            except Exception as e:
+                print(f"⚠️ Could not write {section} as Parquet: {str(e)}")
+                bias_results[section] = table
+        
         bias_results_file = os.path.join(results_folder, 'bias_analysis_results.json')
-        with open(bias_results_file, 'w') as f:
-            json.dump(bias_results, f, indent=2, default=str)
+        with open(bias_results_file, 'wb') as f:
+            f.write(orjson.dumps(bias_results, default=_json_default, option=ORJSON_OPTIONS))
         
-        return jsonify({
+        return fast_jsonify({
             'success': True,
             'session_id': session_id,
             'bias_report': bias_report,
-            'summary': serializable_summary,
+            'summary': summary,
             'visualizations': plot_images,
-            'basic_statistics': serializable_basic_stats,
-            'missing_values': serializable_missing_stats,
-            'class_imbalance': serializable_imbalance_data,
-            'bias_score_analysis': serializable_bias_analysis
+            'visualization_urls': plot_urls,
+            'basic_statistics': basic_stats,
+            'missing_values': missing_stats,
+            'class_imbalance': imbalance_data,
+            'bias_score_analysis': bias_analysis
         })
         
     except Exception as e:
         import traceback
         print(f"❌ Bias analysis failed: {str(e)}")
         print(f"Traceback: {traceback.format_exc()}")
-        return jsonify({'error': f'Bias analysis failed: {str(e)}'}), 500
+        return fast_jsonify({'error': f'Bias analysis failed: {str(e)}'}, 500)
+
+# Common protected attribute keywords
+PROTECTED_KEYWORDS = (
+    'gender', 'sex', 'male', 'female', 'man', 'woman',
+    'race', 'ethnicity', 'ethnic', 'black', 'white', 'asian', 'hispanic', 'latino',
+    'age', 'birth', 'year', 'old', 'young',
+    'religion', 'religious', 'muslim', 'christian', 'jewish', 'hindu', 'buddhist',
+    'disability', 'disabled', 'handicap',
+    'income', 'salary', 'wage', 'wealth', 'poor', 'rich',
+    'education', 'degree', 'school', 'university', 'college',
+    'marital', 'married', 'single', 'divorced',
+    'nationality', 'country', 'origin', 'citizen',
+    'sexual', 'orientation', 'lgbt', 'gay', 'lesbian', 'bisexual'
+)
+
+# Common protected attribute values
+PROTECTED_VALUES = (
+    'male', 'female', 'm', 'f', 'man', 'woman',
+    'white', 'black', 'asian', 'hispanic', 'latino', 'african', 'american',
+    'christian', 'muslim', 'jewish', 'hindu', 'buddhist',
+    'yes', 'no', 'true', 'false', '1', '0'
+)
+
+# One alternation per list so each column is matched in a single regex scan
+_PROTECTED_RE = re.compile('|'.join(re.escape(k) for k in PROTECTED_KEYWORDS), re.IGNORECASE)
+_PROTECTED_VAL_RE = re.compile('|'.join(re.escape(v) for v in PROTECTED_VALUES), re.IGNORECASE)
 
 def auto_detect_protected_attributes(df):
     """Auto-detect potential protected attributes in the dataset"""
     protected_attributes = []
     
-    # Common protected attribute keywords
-    protected_keywords = [
-        'gender', 'sex', 'male', 'female', 'man', 'woman',
-        'race', 'ethnicity', 'ethnic', 'black', 'white', 'asian', 'hispanic', 'latino',
-        'age', 'birth', 'year', 'old', 'young',
-        'religion', 'religious', 'muslim', 'christian', 'jewish', 'hindu', 'buddhist',
-        'disability', 'disabled', 'handicap',
-        'income', 'salary', 'wage', 'wealth', 'poor', 'rich',
-        'education', 'degree', 'school', 'university', 'college',
-        'marital', 'married', 'single', 'divorced',
-        'nationality', 'country', 'origin', 'citizen',
-        'sexual', 'orientation', 'lgbt', 'gay', 'lesbian', 'bisexual'
-    ]
-    
     for col in df.columns:
-        col_lower = col.lower()
         # Check if column name contains protected keywords
-        if any(keyword in col_lower for keyword in protected_keywords):
+        if _PROTECTED_RE.search(str(col)):
             protected_attributes.append(col)
         # Check if column has categorical values that might indicate protected attributes
         elif df[col].dtype == 'object' and df[col].nunique() <= 10:
-            # Check for common protected attribute values
-            unique_values = df[col].dropna().astype(str).str.lower().unique()
-            protected_values = [
-                'male', 'female', 'm', 'f', 'man', 'woman',
-                'white', 'black', 'asian', 'hispanic', 'latino', 'african', 'american',
-                'christian', 'muslim', 'jewish', 'hindu', 'buddhist',
-                'yes', 'no', 'true', 'false', '1', '0'
-            ]
-            if any(any(pv in uv for pv in protected_values) for uv in unique_values):
+            # NUL never occurs in a keyword, so no match can span two values
+            unique_values = df[col].dropna().astype(str).unique()
+            if _PROTECTED_VAL_RE.search('\x00'.join(unique_values)):
                 protected_attributes.append(col)
     
     return list(set(protected_attributes))  # Remove duplicates
 
+# Common target column keywords
+TARGET_KEYWORDS = (
+    'target', 'label', 'outcome', 'result', 'prediction', 'class',
+    'success', 'failure', 'approved', 'denied', 'accepted', 'rejected',
+    'default', 'fraud', 'churn', 'conversion', 'click', 'purchase',
+    'income', 'salary', 'price', 'cost', 'value', 'score',
+    'rating', 'review', 'satisfaction', 'quality'
+)
+
+_TARGET_RE = re.compile('|'.join(re.escape(k) for k in TARGET_KEYWORDS), re.IGNORECASE)
+_BINARY_SET = frozenset({0, 1, True, False})
+
 def auto_detect_target_column(df):
     """Auto-detect potential target column in the dataset"""
-    target_keywords = [
-        'target', 'label', 'outcome', 'result', 'prediction', 'class',
-        'success', 'failure', 'approved', 'denied', 'accepted', 'rejected',
-        'default', 'fraud', 'churn', 'conversion', 'click', 'purchase',
-        'income', 'salary', 'price', 'cost', 'value', 'score',
-        'rating', 'review', 'satisfaction', 'quality'
-    ]
-    
     # Look for columns with target-like names
     for col in df.columns:
-        col_lower = col.lower()
-        if any(keyword in col_lower for keyword in target_keywords):
+        if _TARGET_RE.search(str(col)):
             return col
     
-    # If no obvious target column, look for binary columns
-    for col in df.columns:
-        if df[col].dtype in ['int64', 'float64']:
-            unique_vals = df[col].dropna().unique()
-            if len(unique_vals) == 2 and set(unique_vals).issubset({0, 1, True, False}):
-                return col
+    # If no obvious target column, look for binary columns; count distinct values of all
+    # numeric columns in one vectorized pass and only inspect the two-valued ones
+    n_unique = df.select_dtypes(include=['int64', 'float64']).nunique(dropna=True)
+    for col in n_unique.index[n_unique == 2]:
+        if _BINARY_SET.issuperset(df[col].dropna().unique()):
+            return col
     
     # If still no target found, return None
     return None
@@ -596,7 +837,7 @@ def generate_comprehensive_report():
         data = request.get_json()
         
         if not data or 'session_id' not in data:
-            return jsonify({'error': 'Session ID required'}), 400
+            return fast_jsonify({'error': 'Session ID required'}, 400)
         
         session_id = data['session_id']
         model_name = data.get('model_name', 'Unknown Model')
@@ -604,197 +845,209 @@ def generate_comprehensive_report():
         # Check if we have results from previous analyses
         results_folder = os.path.join(app.config['RESULTS_FOLDER'], session_id)
         if not os.path.exists(results_folder):
-            return jsonify({'error': 'No analysis results found for this session'}), 400
+            return fast_jsonify({'error': 'No analysis results found for this session'}, 400)
         
         # Look for existing analysis files
         fingerprint_file = os.path.join(results_folder, 'fingerprint.json')
         
-        report_sections = []
-        
-        # Header
-        report_sections.append("="*80)
-        report_sections.append("COMPREHENSIVE ETHICAL AI GOVERNANCE REPORT")
-        report_sections.append("="*80)
-        report_sections.append(f"Model: {model_name}")
-        report_sections.append(f"Generated: {datetime.now().isoformat()}")
-        report_sections.append(f"Session ID: {session_id}")
-        report_sections.append("")
-        
-        # Dataset Fingerprint Section
-        if os.path.exists(fingerprint_file):
-            with open(fingerprint_file, 'r') as f:
-                fingerprint_data = json.load(f)
+        # One timestamp for the report header and the response
+        generated_at = datetime.now().isoformat()
+        
+        # Sections stream straight into a temp file that atomically replaces the report when done
+        report_path = os.path.join(results_folder, 'comprehensive_report.txt')
+        with atomic_text_file(report_path) as report_file:
+            def emit(line):
+                report_file.write(line)
+                report_file.write("\n")
             
-            report_sections.append("DATASET FINGERPRINT")
-            report_sections.append("-" * 40)
-            report_sections.append(f"Dataset: {fingerprint_data['file_info']['filename']}")
-            report_sections.append(f"SHA-256 Hash: {fingerprint_data['fingerprint_info']['file_hash_sha256']}")
-            report_sections.append(f"File Size: {fingerprint_data['file_info']['file_size_mb']} MB")
-            report_sections.append(f"Dimensions: {fingerprint_data['schema']['summary_stats']['total_rows']:,} rows × {fingerprint_data['schema']['summary_stats']['total_columns']:,} columns")
-            report_sections.append(f"Data Quality: {fingerprint_data['schema']['summary_stats']['overall_null_percentage']:.2f}% null values")
-            report_sections.append("")
-        
-        # Look for badge data in results folder
-        badge_files = [f for f in os.listdir(results_folder) if f.endswith('.json') and 'badge' in f.lower()]
-        if badge_files:
-            with open(os.path.join(results_folder, badge_files[0]), 'r') as f:
-                badge_data = json.load(f)
+            # Header
+            emit("="*80)
+            emit("COMPREHENSIVE ETHICAL AI GOVERNANCE REPORT")
+            emit("="*80)
+            emit(f"Model: {model_name}")
+            emit(f"Generated: {generated_at}")
+            emit(f"Session ID: {session_id}")
+            emit("")
             
-            report_sections.append("ETHICAL AI BADGE ASSESSMENT")
-            report_sections.append("-" * 40)
-            report_sections.append(f"Overall Score: {badge_data['overall_score']:.1f}/100")
-            report_sections.append(f"Badge Level: {badge_data['badge_level'].upper()}")
-            report_sections.append(f"Passes Threshold: {'✓ YES' if badge_data['passes_threshold'] else '✗ NO'}")
-            report_sections.append("")
+            # Dataset Fingerprint Section
+            if os.path.exists(fingerprint_file):
+                with open(fingerprint_file, 'rb') as f:
+                    fingerprint_data = orjson.loads(f.read())
+                
+                emit("DATASET FINGERPRINT")
+                emit("-" * 40)
+                emit(f"Dataset: {fingerprint_data['file_info']['filename']}")
+                emit(f"SHA-256 Hash: {fingerprint_data['fingerprint_info']['file_hash_sha256']}")
+                emit(f"File Size: {fingerprint_data['file_info']['file_size_mb']} MB")
+                emit(f"Dimensions: {fingerprint_data['schema']['summary_stats']['total_rows']:,} rows × {fingerprint_data['schema']['summary_stats']['total_columns']:,} columns")
+                emit(f"Data Quality: {fingerprint_data['schema']['summary_stats']['overall_null_percentage']:.2f}% null values")
+                emit("")
             
-            report_sections.append("Category Scores:")
-            for category, score in badge_data['category_scores'].items():
-                category_name = category.replace('_', ' ').title()
-                report_sections.append(f"  {category_name}: {score:.1f}/100")
-            report_sections.append("")
+            # Look for badge data in results folder
+            badge_files = [f for f in os.listdir(results_folder) if f.endswith('.json') and 'badge' in f.lower()]
+            if badge_files:
+                with open(os.path.join(results_folder, badge_files[0]), 'rb') as f:
+                    badge_data = orjson.loads(f.read())
+                
+                emit("ETHICAL AI BADGE ASSESSMENT")
+                emit("-" * 40)
+                emit(f"Overall Score: {badge_data['overall_score']:.1f}/100")
+                emit(f"Badge Level: {badge_data['badge_level'].upper()}")
+                emit(f"Passes Threshold: {'✓ YES' if badge_data['passes_threshold'] else '✗ NO'}")
+                emit("")
+                
+                emit("Category Scores:")
+                for category, score in badge_data['category_scores'].items():
+                    category_name = category.replace('_', ' ').title()
+                    emit(f"  {category_name}: {score:.1f}/100")
+                emit("")
+                
+                if badge_data.get('recommendations'):
+                    emit("Recommendations:")
+                    for rec in badge_data['recommendations']:
+                        emit(f"  • {rec}")
+                    emit("")
             
-            if badge_data.get('recommendations'):
-                report_sections.append("Recommendations:")
-                for rec in badge_data['recommendations']:
-                    report_sections.append(f"  • {rec}")
-                report_sections.append("")
-        
-        # Check for bias analysis results
-        bias_plots = [f for f in os.listdir(results_folder) if f.endswith('.png')]
-        bias_results_file = os.path.join(results_folder, 'bias_analysis_results.json')
-        
-        if bias_plots or os.path.exists(bias_results_file):
-            report_sections.append("BIAS ANALYSIS SUMMARY")
-            report_sections.append("-" * 40)
+            # Check for bias analysis results
+            bias_plots = [f for f in os.listdir(results_folder) if f.endswith('.png')]
+            bias_results_file = os.path.join(results_folder, 'bias_analysis_results.json')
             
-            if bias_plots:
-                report_sections.append("Bias analysis completed with visualizations generated.")
-                report_sections.append(f"Generated {len(bias_plots)} visualization(s):")
-                for plot in bias_plots:
-                    report_sections.append(f"  • {plot}")
-                report_sections.append("")
+            if bias_plots or os.path.exists(bias_results_file):
+                emit("BIAS ANALYSIS SUMMARY")
+                emit("-" * 40)
+                
+                if bias_plots:
+                    emit("Bias analysis completed with visualizations generated.")
+                    emit(f"Generated {len(bias_plots)} visualization(s):")
+                    for plot in bias_plots:
+                        emit(f"  • {plot}")
+                    emit("")
+                
+                # Read bias analysis results if available
+                if os.path.exists(bias_results_file):
+                    try:
+                        with open(bias_results_file, 'rb') as f:
+                            bias_results = orjson.loads(f.read())
+                        
+                        bias_analysis = bias_results.get('bias_score_analysis', {})
+                        summary = bias_results.get('summary', {})
+                        
+                        emit("BIAS SCORE ANALYSIS")
+                        emit("-" * 40)
+                        emit(f"Overall Bias Score: {bias_analysis.get('bias_score', 'N/A')}/100")
+                        emit(f"Bias Level: {bias_analysis.get('bias_level', 'UNKNOWN')}")
+                        emit("")
+                        
+                        # Add detailed reasoning
+                        reasoning = bias_analysis.get('reasoning', [])
+                        if reasoning:
+                            emit("Detailed Reasoning:")
+                            for reason in reasoning:
+                                emit(f"  {reason}")
+                            emit("")
+                        
+                        # Add penalties breakdown
+                        penalties = bias_analysis.get('penalties', {})
+                        if penalties:
+                            emit("Penalty Breakdown:")
+                            for penalty_type, penalty_value in penalties.items():
+                                if penalty_value > 0:
+                                    penalty_name = penalty_type.replace('_', ' ').title()
+                                    emit(f"  • {penalty_name}: -{penalty_value:.1f} points")
+                            emit("")
+                        
+                        # Add dataset summary
+                        if summary:
+                            emit("Dataset Summary:")
+                            emit(f"  • Shape: {summary.get('dataset_shape', 'N/A')}")
+                            emit(f"  • Missing Values: {summary.get('total_missing_percentage', 'N/A'):.2f}%")
+                            emit(f"  • Duplicate Rows: {summary.get('duplicate_rows', 'N/A')}")
+                            if summary.get('protected_attributes'):
+                                emit(f"  • Protected Attributes: {', '.join(summary['protected_attributes'])}")
+                            emit("")
+                        
+                    except Exception as e:
+                        emit("BIAS SCORE ANALYSIS")
+                        emit("-" * 40)
+                        emit("Bias analysis completed but results could not be loaded.")
+                        emit(f"Error: {str(e)}")
+                        emit("")
+                else:
+                    emit("BIAS SCORE ANALYSIS")
+                    emit("-" * 40)
+                    emit("Bias analysis completed.")
+                    emit("Detailed reasoning and score breakdown available in the bias analysis results.")
+                    emit("")
             
-            # Read bias analysis results if available
-            if os.path.exists(bias_results_file):
-                try:
-                    with open(bias_results_file, 'r') as f:
-                        bias_results = json.load(f)
-                    
-                    bias_analysis = bias_results.get('bias_score_analysis', {})
-                    summary = bias_results.get('summary', {})
-                    
-                    report_sections.append("BIAS SCORE ANALYSIS")
-                    report_sections.append("-" * 40)
-                    report_sections.append(f"Overall Bias Score: {bias_analysis.get('bias_score', 'N/A')}/100")
-                    report_sections.append(f"Bias Level: {bias_analysis.get('bias_level', 'UNKNOWN')}")
-                    report_sections.append("")
-                    
-                    # Add detailed reasoning
-                    reasoning = bias_analysis.get('reasoning', [])
-                    if reasoning:
-                        report_sections.append("Detailed Reasoning:")
-                        for reason in reasoning:
-                            report_sections.append(f"  {reason}")
-                        report_sections.append("")
-                    
-                    # Add penalties breakdown
-                    penalties = bias_analysis.get('penalties', {})
-                    if penalties:
-                        report_sections.append("Penalty Breakdown:")
-                        for penalty_type, penalty_value in penalties.items():
-                            if penalty_value > 0:
-                                penalty_name = penalty_type.replace('_', ' ').title()
-                                report_sections.append(f"  • {penalty_name}: -{penalty_value:.1f} points")
-                        report_sections.append("")
-                    
-                    # Add dataset summary
-                    if summary:
-                        report_sections.append("Dataset Summary:")
-                        report_sections.append(f"  • Shape: {summary.get('dataset_shape', 'N/A')}")
-                        report_sections.append(f"  • Missing Values: {summary.get('total_missing_percentage', 'N/A'):.2f}%")
-                        report_sections.append(f"  • Duplicate Rows: {summary.get('duplicate_rows', 'N/A')}")
-                        if summary.get('protected_attributes'):
-                            report_sections.append(f"  • Protected Attributes: {', '.join(summary['protected_attributes'])}")
-                        report_sections.append("")
-                    
-                except Exception as e:
-                    report_sections.append("BIAS SCORE ANALYSIS")
-                    report_sections.append("-" * 40)
-                    report_sections.append("Bias analysis completed but results could not be loaded.")
-                    report_sections.append(f"Error: {str(e)}")
-                    report_sections.append("")
-            else:
-                report_sections.append("BIAS SCORE ANALYSIS")
-                report_sections.append("-" * 40)
-                report_sections.append("Bias analysis completed.")
-                report_sections.append("Detailed reasoning and score breakdown available in the bias analysis results.")
-                report_sections.append("")
-        
-        # Conclusions and Recommendations
-        report_sections.append("CONCLUSIONS AND RECOMMENDATIONS")
-        report_sections.append("-" * 40)
-        
-        # Determine overall compliance level
-        overall_compliance = "UNKNOWN"
-        if badge_files:
-            if badge_data.get('passes_threshold'):
-                overall_compliance = "COMPLIANT"
-            else:
-                overall_compliance = "NON-COMPLIANT"
-        
-        report_sections.append(f"Overall Compliance Status: {overall_compliance}")
-        report_sections.append("")
-        
-        report_sections.append("Next Steps:")
-        report_sections.append("  1. Review all identified issues and recommendations")
-        report_sections.append("  2. Implement suggested improvements")
-        report_sections.append("  3. Conduct regular audits and monitoring")
-        report_sections.append("  4. Document all governance processes")
-        report_sections.append("")
-        
-        report_sections.append("="*80)
-        report_sections.append("END OF REPORT")
-        report_sections.append("="*80)
-        
-        # Save comprehensive report
-        report_content = "\n".join(report_sections)
-        report_path = os.path.join(results_folder, 'comprehensive_report.txt')
-        with open(report_path, 'w') as f:
-            f.write(report_content)
+            # Conclusions and Recommendations
+            emit("CONCLUSIONS AND RECOMMENDATIONS")
+            emit("-" * 40)
+            
+            # Determine overall compliance level
+            overall_compliance = "UNKNOWN"
+            if badge_files:
+                if badge_data.get('passes_threshold'):
+                    overall_compliance = "COMPLIANT"
+                else:
+                    overall_compliance = "NON-COMPLIANT"
+            
+            emit(f"Overall Compliance Status: {overall_compliance}")
+            emit("")
+            
+            emit("Next Steps:")
+            emit("  1. Review all identified issues and recommendations")
+            emit("  2. Implement suggested improvements")
+            emit("  3. Conduct regular audits and monitoring")
+            emit("  4. Document all governance processes")
+            emit("")
+            
+            emit("="*80)
+            emit("END OF REPORT")
+            report_file.write("="*80)
+        
+        # The frontend shows the text inline; ?inline=0 returns only its URL
+        report_content = None
+        if request.args.get('inline') not in ('0', 'false'):
+            report_content = read_text_mapped(report_path)
         
-        return jsonify({
+        return fast_jsonify({
             'success': True,
             'session_id': session_id,
             'report_content': report_content,
             'report_file': report_path,
+            'report_url': result_url(session_id, os.path.basename(report_path)),
+            'report_size': os.path.getsize(report_path),
             'compliance_status': overall_compliance,
-            'generated_at': datetime.now().isoformat()
+            'generated_at': generated_at
         })
         
     except Exception as e:
-        return jsonify({'error': f'Report generation failed: {str(e)}'}), 500
+        return fast_jsonify({'error': f'Report generation failed: {str(e)}'}, 500)
 
 @app.route('/api/download/<session_id>/<filename>', methods=['GET'])
 def download_file(session_id, filename):
     """Download generated files"""
     try:
-        # Check both results and upload folders
-        file_path = None
-        
-        results_path = os.path.join(app.config['RESULTS_FOLDER'], session_id, filename)
-        upload_path = os.path.join(app.config['UPLOAD_FOLDER'], session_id, filename)
+        # Check both results and upload folders; send_from_directory rejects paths that
+        # escape them and answers conditional GETs (ETag/Last-Modified) with 304
+        for folder in (app.config['RESULTS_FOLDER'], app.config['UPLOAD_FOLDER']):
+            try:
+                return send_from_directory(os.path.join(folder, session_id), filename,
+                                           as_attachment=True, conditional=True, etag=True)
+            except NotFound:
+                continue
         
-        if os.path.exists(results_path):
-            file_path = results_path
-        elif os.path.exists(upload_path):
-            file_path = upload_path
-        else:
-            return jsonify({'error': 'File not found'}), 404
-        
-        return send_file(file_path, as_attachment=True, download_name=filename)
+        return fast_jsonify({'error': 'File not found'}, 404)
         
     except Exception as e:
-        return jsonify({'error': f'Download failed: {str(e)}'}), 500
+        return fast_jsonify({'error': f'Download failed: {str(e)}'}, 500)
+
+@app.route('/api/result/<session_id>/<path:name>', methods=['GET'])
+def get_result_file(session_id, name):
+    """Serve a generated result (badge or plot image) with HTTP caching"""
+    results_folder = os.path.join(app.config['RESULTS_FOLDER'], secure_filename(session_id))
+    # send_from_directory rejects paths that escape results_folder
+    return send_from_directory(results_folder, name, conditional=True, max_age=3600)
 
 @app.route('/api/session/<session_id>/files', methods=['GET'])
 def list_session_files(session_id):
@@ -805,37 +1058,39 @@ def list_session_files(session_id):
         # Check results folder
         results_folder = os.path.join(app.config['RESULTS_FOLDER'], session_id)
         if os.path.exists(results_folder):
-            for filename in os.listdir(results_folder):
-                file_path = os.path.join(results_folder, filename)
-                file_stats = os.stat(file_path)
-                files.append({
-                    'filename': filename,
-                    'type': 'result',
-                    'size': file_stats.st_size,
-                    'modified': datetime.fromtimestamp(file_stats.st_mtime).isoformat()
-                })
+            with os.scandir(results_folder) as entries:
+                for entry in entries:
+                    file_stats = entry.stat()
+                    files.append({
+                        'filename': entry.name,
+                        'type': 'result',
+                        'size': file_stats.st_size,
+                        'modified': datetime.fromtimestamp(file_stats.st_mtime).isoformat()
+                    })
         
         # Check upload folder
         upload_folder = os.path.join(app.config['UPLOAD_FOLDER'], session_id)
         if os.path.exists(upload_folder):
-            for filename in os.listdir(upload_folder):
-                file_path = os.path.join(upload_folder, filename)
-                file_stats = os.stat(file_path)
-                files.append({
-                    'filename': filename,
-                    'type': 'upload',
-                    'size': file_stats.st_size,
-                    'modified': datetime.fromtimestamp(file_stats.st_mtime).isoformat()
-                })
-        
-        return jsonify({
+            with os.scandir(upload_folder) as entries:
+                for entry in entries:
+                    if is_internal_file(entry.name):
+                        continue
+                    file_stats = entry.stat()
+                    files.append({
+                        'filename': entry.name,
+                        'type': 'upload',
+                        'size': file_stats.st_size,
+                        'modified': datetime.fromtimestamp(file_stats.st_mtime).isoformat()
+                    })
+        
+        return fast_jsonify({
             'success': True,
             'session_id': session_id,
             'files': files
         })
         
     except Exception as e:
-        return jsonify({'error': f'Failed to list files: {str(e)}'}), 500
+        return fast_jsonify({'error': f'Failed to list files: {str(e)}'}, 500)
 
 @app.route('/api/cleanup/<session_id>', methods=['DELETE'])
 def cleanup_session(session_id):
@@ -846,35 +1101,53 @@ def cleanup_session(session_id):
         # Clean up results folder
         results_folder = os.path.join(app.config['RESULTS_FOLDER'], session_id)
         if os.path.exists(results_folder):
-            shutil.rmtree(results_folder)
+            remove_folder_in_background(results_folder)
             cleanup_count += 1
         
         # Clean up upload folder
         upload_folder = os.path.join(app.config['UPLOAD_FOLDER'], session_id)
         if os.path.exists(upload_folder):
-            shutil.rmtree(upload_folder)
+            remove_folder_in_background(upload_folder)
             cleanup_count += 1
         
-        return jsonify({
+        return fast_jsonify({
             'success': True,
             'session_id': session_id,
             'cleaned_folders': cleanup_count
         })
         
     except Exception as e:
-        return jsonify({'error': f'Cleanup failed: {str(e)}'}), 500
+        return fast_jsonify({'error': f'Cleanup failed: {str(e)}'}, 500)
+
+@app.after_request
+def compress_response(response):
+    """gzip large JSON/text bodies (e.g. the comprehensive report) for clients that accept it"""
+    if (response.status_code != 200 or response.direct_passthrough
+            or response.mimetype not in COMPRESS_MIMETYPES
+            or 'Content-Encoding' in response.headers
+            or 'gzip' not in request.headers.get('Accept-Encoding', '').lower()):
+        return response
+    
+    body = response.get_data()
+    if len(body) < COMPRESS_MIN_SIZE:
+        return response
+    
+    response.set_data(gzip.compress(body, compresslevel=COMPRESS_LEVEL))
+    response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    return response
 
 @app.errorhandler(413)
 def too_large(e):
-    return jsonify({'error': 'File too large'}), 413
+    return fast_jsonify({'error': 'File too large'}, 413)
 
 @app.errorhandler(404)
 def not_found(e):
-    return jsonify({'error': 'Endpoint not found'}), 404
+    return fast_jsonify({'error': 'Endpoint not found'}, 404)
 
 @app.errorhandler(500)
 def internal_error(e):
-    return jsonify({'error': 'Internal server error'}), 500
+    return fast_jsonify({'error': 'Internal server error'}, 500)
 
 if __name__ == '__main__':
     print("="*60)
@@ -882,11 +1155,12 @@ if __name__ == '__main__':
     print("="*60)
     print("Available endpoints:")
     print("  POST /api/upload - Upload dataset file")
-    print("  POST /api/badge/generate - Generate ethical AI badge")
+    print("  POST /api/badge/generate - Generate ethical AI badge (?format=json for the verdict only)")
     print("  POST /api/fingerprint/generate - Generate dataset fingerprint")
     print("  POST /api/bias/analyze - Analyze dataset for bias")
     print("  POST /api/report/comprehensive - Generate comprehensive report")
     print("  GET  /api/download/<session_id>/<filename> - Download files")
+    print("  GET  /api/result/<session_id>/<name> - Serve generated badge and plot images")
     print("  GET  /api/session/<session_id>/files - List session files")
     print("  DELETE /api/cleanup/<session_id> - Clean up session")
     print("  GET  /api/health - Health check")
@@ -0,0 +1,29 @@
+"""
+Gunicorn configuration for the Flask API
+Run from the api folder: gunicorn -c gunicorn.conf.py app:app
+"""
+
+import os
+import multiprocessing
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('GUNICORN_WORKERS', 2 * multiprocessing.cpu_count() + 1))
+
+# Uploads, CSV parsing and matplotlib block on disk and CPU rather than sockets, so threaded
+# workers suit the analysis endpoints better than gevent; MongoDB waits still release the GIL.
+# GUNICORN_WORKER_CLASS=gevent remains an option for verification-only deployments.
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 1000))
+
+# Large bias analyses can take minutes
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 300))
+
+# Recycle workers periodically to hand back memory matplotlib and pandas hold on to
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 200))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 20))
+
+# preload_app stays off: each worker imports app.py itself, and api_verification opens that
+# worker's MongoDB pool at import time, before the worker accepts traffic. With preload the
+# master's client would be inherited across fork and only replaced on the first request.
+preload_app = False
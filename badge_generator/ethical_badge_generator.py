@@ -11,72 +11,194 @@ from PIL import Image, ImageDraw, ImageFont
 import io
 import base64
 import os
+import re
 from pathlib import Path
+from functools import lru_cache
+from itertools import islice
+from string import Template
+from concurrent.futures import ThreadPoolExecutor
+import multiprocessing
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Badge font sizes (title, score, text, small) and the font files tried in order
+BADGE_FONT_SIZES = (24, 48, 16, 12)
+BADGE_FONT_PATHS = ("arial.ttf", "/System/Library/Fonts/Arial.ttf")
+
+@lru_cache(maxsize=1)
+def load_badge_fonts():
+    """Load the badge fonts once per process (title, score, text, small)"""
+    # Try to load fonts, fall back to default if not available
+    for font_path in BADGE_FONT_PATHS:
+        try:
+            return tuple(ImageFont.truetype(font_path, size) for size in BADGE_FONT_SIZES)
+        except OSError:
+            continue
+    
+    # Use default font
+    default_font = ImageFont.load_default()
+    return (default_font,) * len(BADGE_FONT_SIZES)
+
+@lru_cache(maxsize=256)
+def measure_text(text, font):
+    """Bounding box of text in a badge font; titles, labels and scores repeat across badges"""
+    return ImageDraw.Draw(Image.new('RGB', (1, 1))).textbbox((0, 0), text, font=font)
+
+# Badge scores run from 0 to MAX_SCORE
+MAX_SCORE = 100
+
+def build_score_table(levels_by_score):
+    """Lookup table of badge levels indexed by integer score, from (level, min_score) pairs sorted high to low"""
+    return tuple(
+        next((level for level, min_score in levels_by_score if score >= min_score), 'insufficient')
+        for score in range(MAX_SCORE + 1)
+    )
+
+# Category scores drawn on a badge (the rest only appear in its JSON metadata)
+MAX_BADGE_CATEGORIES = 3
+
+# Characters dropped from model names when building badge filenames
+# (\w keeps Unicode letters/digits and '_', matching the old isalnum() filter)
+UNSAFE_FILENAME_RE = re.compile(r'[^\w \-]')
+
+# SVG badge markup, parsed once; create_svg_badge fills in the placeholders
+SVG_BADGE_HEADER = Template("""
+        <svg width="400" height="300" xmlns="http://www.w3.org/2000/svg">
+            <!-- Background -->
+            <rect width="400" height="300" fill="white" stroke="$border_color" stroke-width="8"/>
+            
+            <!-- Header -->
+            <rect x="8" y="8" width="384" height="72" fill="$color"/>
+            
+            <!-- Title -->
+            <text x="200" y="35" text-anchor="middle" fill="$text_color" 
+                  font-family="Arial, sans-serif" font-size="24" font-weight="bold">
+                ETHICAL AI BADGE
+            </text>
+            
+            <!-- Badge Level -->
+            <text x="200" y="60" text-anchor="middle" fill="$text_color" 
+                  font-family="Arial, sans-serif" font-size="16">
+                $label
+            </text>
+            
+            <!-- Score Circle -->
+            <circle cx="200" cy="140" r="40" fill="$color" 
+                    stroke="$border_color" stroke-width="3"/>
+            
+            <!-- Score Text -->
+            <text x="200" y="155" text-anchor="middle" fill="$text_color" 
+                  font-family="Arial, sans-serif" font-size="48" font-weight="bold">
+                $score
+            </text>
+            
+            <!-- Model Name -->
+            <text x="200" y="210" text-anchor="middle" fill="black" 
+                  font-family="Arial, sans-serif" font-size="16">
+                Model: $model_name
+            </text>
+        """)
+
+SVG_CATEGORY_ROW = Template("""
+                <text x="20" y="$y" fill="black" 
+                      font-family="Arial, sans-serif" font-size="12">
+                    $name: $score
+                </text>
+                """)
+
+SVG_BADGE_FOOTER = Template("""
+            <text x="20" y="285" fill="gray" 
+                  font-family="Arial, sans-serif" font-size="12">
+                Generated: $timestamp
+            </text>
+        </svg>
+        """)
 
 class EthicalBadgeGenerator:
-    def __init__(self):
-        """Initialize the badge generator with default settings"""
-        self.badge_templates = {
-            'excellent': {
-                'color': '#2E8B57',  # Sea Green
-                'text_color': '#FFFFFF',
-                'border_color': '#1F5F3F',
-                'label': 'EXCELLENT',
-                'min_score': 90
-            },
-            'good': {
-                'color': '#4169E1',  # Royal Blue
-                'text_color': '#FFFFFF',
-                'border_color': '#2E4BC7',
-                'label': 'GOOD',
-                'min_score': 75
-            },
-            'satisfactory': {
-                'color': '#FFD700',  # Gold
-                'text_color': '#000000',
-                'border_color': '#E6C200',
-                'label': 'SATISFACTORY',
-                'min_score': 60
-            },
-            'needs_improvement': {
-                'color': '#FF8C00',  # Dark Orange
-                'text_color': '#FFFFFF',
-                'border_color': '#E67E00',
-                'label': 'NEEDS IMPROVEMENT',
-                'min_score': 40
-            },
-            'insufficient': {
-                'color': '#DC143C',  # Crimson
-                'text_color': '#FFFFFF',
-                'border_color': '#B71C1C',
-                'label': 'INSUFFICIENT',
-                'min_score': 0
-            }
+    # Badge styles and category names are fixed, so they are shared by all instances
+    badge_templates = {
+        'excellent': {
+            'color': '#2E8B57',  # Sea Green
+            'text_color': '#FFFFFF',
+            'border_color': '#1F5F3F',
+            'label': 'EXCELLENT',
+            'min_score': 90
+        },
+        'good': {
+            'color': '#4169E1',  # Royal Blue
+            'text_color': '#FFFFFF',
+            'border_color': '#2E4BC7',
+            'label': 'GOOD',
+            'min_score': 75
+        },
+        'satisfactory': {
+            'color': '#FFD700',  # Gold
+            'text_color': '#000000',
+            'border_color': '#E6C200',
+            'label': 'SATISFACTORY',
+            'min_score': 60
+        },
+        'needs_improvement': {
+            'color': '#FF8C00',  # Dark Orange
+            'text_color': '#FFFFFF',
+            'border_color': '#E67E00',
+            'label': 'NEEDS IMPROVEMENT',
+            'min_score': 40
+        },
+        'insufficient': {
+            'color': '#DC143C',  # Crimson
+            'text_color': '#FFFFFF',
+            'border_color': '#B71C1C',
+            'label': 'INSUFFICIENT',
+            'min_score': 0
         }
-        
-        self.ethical_categories = {
-            'bias_fairness': 'Bias & Fairness',
-            'transparency': 'Transparency',
-            'privacy': 'Privacy Protection',
-            'accountability': 'Accountability',
-            'robustness': 'Robustness',
-            'human_oversight': 'Human Oversight'
-        }
-        
+    }
+    
+    ethical_categories = {
+        'bias_fairness': 'Bias & Fairness',
+        'transparency': 'Transparency',
+        'privacy': 'Privacy Protection',
+        'accountability': 'Accountability',
+        'robustness': 'Robustness',
+        'human_oversight': 'Human Oversight'
+    }
+    
+    # Weights for the overall score (can be customized)
+    category_weights = {
+        'bias_fairness': 0.25,
+        'transparency': 0.15,
+        'privacy': 0.20,
+        'accountability': 0.15,
+        'robustness': 0.15,
+        'human_oversight': 0.10
+    }
+    
+    # (exclusive upper bound, message) per category score band, lowest band first
+    recommendation_bands = (
+        (50, "Critical improvement needed in {}"),
+        (70, "Consider enhancing {} measures")
+    )
+    
+    # (level, min_score) from the highest threshold down, so the first match wins
+    levels_by_score = tuple(
+        (level, config['min_score'])
+        for level, config in sorted(badge_templates.items(), key=lambda item: item[1]['min_score'], reverse=True)
+    )
+    
+    # Badge level for every integer score 0-100; thresholds are whole numbers, so
+    # truncating a score never changes its level
+    score_to_level = build_score_table(levels_by_score)
+    
     def calculate_overall_score(self, category_scores):
         """Calculate overall ethical score from category scores"""
         if not category_scores:
             return 0
         
-        # Weighted average (can be customized)
-        weights = {
-            'bias_fairness': 0.25,
-            'transparency': 0.15,
-            'privacy': 0.20,
-            'accountability': 0.15,
-            'robustness': 0.15,
-            'human_oversight': 0.10
-        }
+        # Weighted average
+        weights = self.category_weights
         
         total_weighted_score = 0
         total_weight = 0
@@ -93,40 +215,19 @@ class EthicalBadgeGenerator:
     
     def determine_badge_level(self, score):
         """Determine badge level based on score"""
-        for level, config in reversed(list(self.badge_templates.items())):
-            if score >= config['min_score']:
-                return level
-        return 'insufficient'
+        return self.score_to_level[min(MAX_SCORE, max(0, int(score)))]
     
-    def create_badge_image(self, badge_level, score, model_name, category_scores=None, 
-                          width=400, height=300):
-        """Create badge image using PIL"""
-        
-        # Get badge configuration
-        config = self.badge_templates[badge_level]
+    @classmethod
+    @lru_cache(maxsize=16)
+    def _base_image(cls, badge_level, width, height):
+        """Border, header, title, level label and score circle; they depend only on the level and size"""
+        config = cls.badge_templates[badge_level]
         
         # Create image
         img = Image.new('RGB', (width, height), 'white')
         draw = ImageDraw.Draw(img)
         
-        # Try to load fonts, fall back to default if not available
-        try:
-            title_font = ImageFont.truetype("arial.ttf", 24)
-            score_font = ImageFont.truetype("arial.ttf", 48)
-            text_font = ImageFont.truetype("arial.ttf", 16)
-            small_font = ImageFont.truetype("arial.ttf", 12)
-        except:
-            try:
-                title_font = ImageFont.truetype("/System/Library/Fonts/Arial.ttf", 24)
-                score_font = ImageFont.truetype("/System/Library/Fonts/Arial.ttf", 48)
-                text_font = ImageFont.truetype("/System/Library/Fonts/Arial.ttf", 16)
-                small_font = ImageFont.truetype("/System/Library/Fonts/Arial.ttf", 12)
-            except:
-                # Use default font
-                title_font = ImageFont.load_default()
-                score_font = ImageFont.load_default()
-                text_font = ImageFont.load_default()
-                small_font = ImageFont.load_default()
+        title_font, score_font, text_font, small_font = load_badge_fonts()
         
         # Draw border
         border_width = 8
@@ -142,14 +243,14 @@ class EthicalBadgeGenerator:
         
         # Draw title
         title_text = "ETHICAL AI BADGE"
-        title_bbox = draw.textbbox((0, 0), title_text, font=title_font)
+        title_bbox = measure_text(title_text, title_font)
         title_width = title_bbox[2] - title_bbox[0]
         draw.text(((width - title_width) // 2, 20), title_text, 
                  fill=config['text_color'], font=title_font)
         
         # Draw badge level
         level_text = config['label']
-        level_bbox = draw.textbbox((0, 0), level_text, font=text_font)
+        level_bbox = measure_text(level_text, text_font)
         level_width = level_bbox[2] - level_bbox[0]
         draw.text(((width - level_width) // 2, 45), level_text, 
                  fill=config['text_color'], font=text_font)
@@ -164,9 +265,28 @@ class EthicalBadgeGenerator:
                      circle_center_x + circle_radius, circle_center_y + circle_radius],
                     fill=config['color'], outline=config['border_color'], width=3)
         
+        return img
+    
+    def create_badge_image(self, badge_level, score, model_name, category_scores=None, 
+                          width=400, height=300, generated_at=None):
+        """Create badge image using PIL"""
+        
+        # Get badge configuration
+        config = self.badge_templates[badge_level]
+        
+        # Start from the cached level-specific frame and draw only the per-badge content
+        img = self._base_image(badge_level, width, height).copy()
+        draw = ImageDraw.Draw(img)
+        
+        title_font, score_font, text_font, small_font = load_badge_fonts()
+        
+        # Score circle position (the circle itself is part of the base image)
+        circle_center_x = width // 2
+        circle_center_y = 140
+        
         # Draw score
         score_text = f"{score:.0f}"
-        score_bbox = draw.textbbox((0, 0), score_text, font=score_font)
+        score_bbox = measure_text(score_text, score_font)
         score_width = score_bbox[2] - score_bbox[0]
         score_height = score_bbox[3] - score_bbox[1]
         draw.text((circle_center_x - score_width // 2, 
@@ -175,7 +295,7 @@ class EthicalBadgeGenerator:
         
         # Draw model name
         model_text = f"Model: {model_name}"
-        model_bbox = draw.textbbox((0, 0), model_text, font=text_font)
+        model_bbox = measure_text(model_text, text_font)
         model_width = model_bbox[2] - model_bbox[0]
         draw.text(((width - model_width) // 2, 200), model_text, 
                  fill='black', font=text_font)
@@ -183,89 +303,43 @@ class EthicalBadgeGenerator:
         # Draw category scores if provided
         if category_scores:
             y_start = 230
-            for i, (category, cat_score) in enumerate(category_scores.items()):
-                if i >= 3:  # Limit to 3 categories for space
-                    break
+            # Limit to 3 categories for space
+            for i, (category, cat_score) in enumerate(islice(category_scores.items(), MAX_BADGE_CATEGORIES)):
                 category_name = self.ethical_categories.get(category, category)
                 cat_text = f"{category_name}: {cat_score:.0f}"
                 draw.text((20, y_start + i * 15), cat_text, 
                          fill='black', font=small_font)
         
         # Draw timestamp
-        timestamp = datetime.now().strftime("%Y-%m-%d")
+        timestamp = (generated_at or datetime.now()).strftime("%Y-%m-%d")
         timestamp_text = f"Generated: {timestamp}"
         draw.text((20, height - 25), timestamp_text, 
                  fill='gray', font=small_font)
         
         return img
     
-    def create_svg_badge(self, badge_level, score, model_name, category_scores=None):
+    def create_svg_badge(self, badge_level, score, model_name, category_scores=None, generated_at=None):
         """Create badge as SVG (scalable vector graphics)"""
         config = self.badge_templates[badge_level]
         
-        svg_template = f"""
-        <svg width="400" height="300" xmlns="http://www.w3.org/2000/svg">
-            <!-- Background -->
-            <rect width="400" height="300" fill="white" stroke="{config['border_color']}" stroke-width="8"/>
-            
-            <!-- Header -->
-            <rect x="8" y="8" width="384" height="72" fill="{config['color']}"/>
-            
-            <!-- Title -->
-            <text x="200" y="35" text-anchor="middle" fill="{config['text_color']}" 
-                  font-family="Arial, sans-serif" font-size="24" font-weight="bold">
-                ETHICAL AI BADGE
-            </text>
-            
-            <!-- Badge Level -->
-            <text x="200" y="60" text-anchor="middle" fill="{config['text_color']}" 
-                  font-family="Arial, sans-serif" font-size="16">
-                {config['label']}
-            </text>
-            
-            <!-- Score Circle -->
-            <circle cx="200" cy="140" r="40" fill="{config['color']}" 
-                    stroke="{config['border_color']}" stroke-width="3"/>
-            
-            <!-- Score Text -->
-            <text x="200" y="155" text-anchor="middle" fill="{config['text_color']}" 
-                  font-family="Arial, sans-serif" font-size="48" font-weight="bold">
-                {score:.0f}
-            </text>
-            
-            <!-- Model Name -->
-            <text x="200" y="210" text-anchor="middle" fill="black" 
-                  font-family="Arial, sans-serif" font-size="16">
-                Model: {model_name}
-            </text>
-        """
+        svg_parts = [SVG_BADGE_HEADER.substitute(
+            border_color=config['border_color'], color=config['color'],
+            text_color=config['text_color'], label=config['label'],
+            score=f"{score:.0f}", model_name=model_name)]
         
         # Add category scores
         if category_scores:
-            y_pos = 240
-            for i, (category, cat_score) in enumerate(category_scores.items()):
-                if i >= 3:  # Limit for space
-                    break
+            # Limit for space
+            for i, (category, cat_score) in enumerate(islice(category_scores.items(), MAX_BADGE_CATEGORIES)):
                 category_name = self.ethical_categories.get(category, category)
-                svg_template += f"""
-                <text x="20" y="{y_pos}" fill="black" 
-                      font-family="Arial, sans-serif" font-size="12">
-                    {category_name}: {cat_score:.0f}
-                </text>
-                """
-                y_pos += 15
+                svg_parts.append(SVG_CATEGORY_ROW.substitute(
+                    y=240 + i * 15, name=category_name, score=f"{cat_score:.0f}"))
         
         # Add timestamp
-        timestamp = datetime.now().strftime("%Y-%m-%d")
-        svg_template += f"""
-            <text x="20" y="285" fill="gray" 
-                  font-family="Arial, sans-serif" font-size="12">
-                Generated: {timestamp}
-            </text>
-        </svg>
-        """
+        timestamp = (generated_at or datetime.now()).strftime("%Y-%m-%d")
+        svg_parts.append(SVG_BADGE_FOOTER.substitute(timestamp=timestamp))
         
-        return svg_template
+        return "".join(svg_parts)
     
     def generate_badge_data(self, model_name, category_scores, threshold=60, overall_score=None):
         """Generate complete badge data including pass/fail determination"""
@@ -301,11 +375,10 @@ class EthicalBadgeGenerator:
             recommendations.append("Overall ethical compliance needs significant improvement")
         
         for category, score in category_scores.items():
-            category_name = self.ethical_categories.get(category, category)
-            if score < 50:
-                recommendations.append(f"Critical improvement needed in {category_name}")
-            elif score < 70:
-                recommendations.append(f"Consider enhancing {category_name} measures")
+            for upper_bound, message in self.recommendation_bands:
+                if score < upper_bound:
+                    recommendations.append(message.format(self.ethical_categories.get(category, category)))
+                    break
         
         if not recommendations:
             recommendations.append("Maintain current ethical standards and continue monitoring")
@@ -317,47 +390,62 @@ class EthicalBadgeGenerator:
         output_path = Path(output_dir)
         output_path.mkdir(exist_ok=True)
         
-        model_name_clean = "".join(c for c in badge_data['model_name'] 
-                                 if c.isalnum() or c in (' ', '-', '_')).rstrip()
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        model_name_clean = UNSAFE_FILENAME_RE.sub('', badge_data['model_name']).rstrip()
+        # Reuse the badge's own timestamp so filenames and drawn dates match its metadata
+        generated_at = (datetime.fromisoformat(badge_data['generated_at'])
+                        if badge_data.get('generated_at') else datetime.now())
+        timestamp = generated_at.strftime("%Y%m%d_%H%M%S")
         base_filename = f"{model_name_clean}_{badge_data['badge_level']}_{timestamp}"
         
-        saved_files = []
-        
-        # Save PNG
-        if 'png' in formats:
-            img = self.create_badge_image(
-                badge_data['badge_level'],
-                badge_data['overall_score'],
-                badge_data['model_name'],
-                badge_data['category_scores']
-            )
-            png_path = output_path / f"{base_filename}.png"
-            img.save(png_path)
-            saved_files.append(str(png_path))
-        
-        # Save SVG
-        if 'svg' in formats:
-            svg_content = self.create_svg_badge(
-                badge_data['badge_level'],
-                badge_data['overall_score'],
-                badge_data['model_name'],
-                badge_data['category_scores']
-            )
-            svg_path = output_path / f"{base_filename}.svg"
-            with open(svg_path, 'w') as f:
-                f.write(svg_content)
-            saved_files.append(str(svg_path))
-        
-        # Save JSON metadata
-        if 'json' in formats:
-            json_path = output_path / f"{base_filename}.json"
-            with open(json_path, 'w') as f:
-                json.dump(badge_data, f, indent=2)
-            saved_files.append(str(json_path))
+        # PNG encoding releases the GIL, so the three formats are written side by side
+        savers = {
+            'png': self._save_png,
+            'svg': self._save_svg,
+            'json': self._save_json
+        }
+        with ThreadPoolExecutor(max_workers=len(savers)) as executor:
+            futures = [executor.submit(savers[fmt], badge_data, output_path / f"{base_filename}.{fmt}",
+                                       generated_at)
+                       for fmt in ('png', 'svg', 'json') if fmt in formats]
+            saved_files = [future.result() for future in futures]
         
         return saved_files
     
+    def _save_png(self, badge_data, png_path, generated_at=None):
+        """Render and write the PNG badge"""
+        img = self.create_badge_image(
+            badge_data['badge_level'],
+            badge_data['overall_score'],
+            badge_data['model_name'],
+            badge_data['category_scores'],
+            generated_at=generated_at
+        )
+        img.save(png_path, compress_level=1)
+        return str(png_path)
+    
+    def _save_svg(self, badge_data, svg_path, generated_at=None):
+        """Render and write the SVG badge"""
+        svg_content = self.create_svg_badge(
+            badge_data['badge_level'],
+            badge_data['overall_score'],
+            badge_data['model_name'],
+            badge_data['category_scores'],
+            generated_at=generated_at
+        )
+        with open(svg_path, 'w') as f:
+            f.write(svg_content)
+        return str(svg_path)
+    
+    def _save_json(self, badge_data, json_path, generated_at=None):
+        """Write the badge metadata"""
+        if orjson is not None:
+            with open(json_path, 'wb') as f:
+                f.write(orjson.dumps(badge_data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+        else:
+            with open(json_path, 'w') as f:
+                json.dump(badge_data, f, indent=2)
+        return str(json_path)
+    
     def print_badge_summary(self, badge_data):
         """Print a summary of the badge"""
         print("="*60)
@@ -379,6 +467,24 @@ class EthicalBadgeGenerator:
         
         print(f"\nGenerated: {badge_data['generated_at']}")
 
+# The generator keeps no per-call state, so one shared instance serves every caller
+DEFAULT_GENERATOR = EthicalBadgeGenerator()
+
+def _generate_and_save(model_name, category_scores, output_dir, formats, threshold):
+    """Generate and save one badge (top-level so worker processes can unpickle it)"""
+    badge_data = DEFAULT_GENERATOR.generate_badge_data(model_name, category_scores, threshold)
+    return DEFAULT_GENERATOR.save_badge(badge_data, output_dir, list(formats))
+
+def generate_badges_batch(items, output_dir="badges", formats=('png', 'svg', 'json'), threshold=60,
+                          processes=None):
+    """Generate badges for many (model_name, category_scores) pairs across CPU cores"""
+    # Rendering and PNG encoding are CPU-bound and independent per model
+    Path(output_dir).mkdir(exist_ok=True)
+    with multiprocessing.Pool(processes) as pool:
+        return pool.starmap(_generate_and_save,
+                            [(model_name, scores, output_dir, formats, threshold)
+                             for model_name, scores in items])
+
 def main():
     """Main function for command-line usage"""
     parser = argparse.ArgumentParser(description='Generate Ethical AI Badge')
@@ -400,7 +506,7 @@ def main():
             category_scores = json.loads(args.scores)
         
         # Generate badge
-        generator = EthicalBadgeGenerator()
+        generator = DEFAULT_GENERATOR
         badge_data = generator.generate_badge_data(
             args.model_name, 
             category_scores, 
@@ -432,7 +538,7 @@ def main():
 # Example usage function
 def example_usage():
     """Example of how to use the badge generator programmatically"""
-    generator = EthicalBadgeGenerator()
+    generator = DEFAULT_GENERATOR
     
     # Example scores
     example_scores = {
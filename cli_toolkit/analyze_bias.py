@@ -11,10 +11,49 @@ import seaborn as sns
 from scipy import stats
 from sklearn.metrics import confusion_matrix, classification_report
 import warnings
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 warnings.filterwarnings('ignore')
 
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# zlib level 1 keeps PNG encoding cheap; the files are a little larger but written much faster
+PNG_SAVE_KWARGS = {'compress_level': 1}
+
+# A single writer thread rasterizes and compresses the plot PNGs, so figures are never drawn concurrently
+PLOT_WRITER = ThreadPoolExecutor(max_workers=1, thread_name_prefix='bias-plots')
+
+# Above this many rows the missing-values heatmap becomes a per-column bar chart
+MISSING_HEATMAP_MAX_ROWS = 10_000
+
+def _count_confusion(group_ids, actual, predicted, n_groups):
+    """Tally counts[group, actual, predicted] in one pass, skipping missing groups and non-binary labels"""
+    counts = np.zeros((n_groups, 2, 2), dtype=np.int64)
+    for i in range(group_ids.shape[0]):
+        group = group_ids[i]
+        if group >= 0 and actual[i] >= 0:
+            counts[group, actual[i], predicted[i]] += 1
+    return counts
+
+# Compiled with Numba when it is installed; otherwise fairness_metrics counts with a pandas groupby
+_count_confusion_jit = njit(cache=True)(_count_confusion) if njit is not None else None
+
+def _save_figures(figures, dpi):
+    """Write each (figure, path) pair as a PNG"""
+    for figure, path in figures:
+        figure.savefig(path, dpi=dpi, bbox_inches='tight', pil_kwargs=PNG_SAVE_KWARGS)
+
 class BiasAnalyzer:
-    def __init__(self, df, target_col=None, protected_attributes=None):
+    def __init__(self, df, target_col=None, protected_attributes=None, use_polars=False, copy=False):
         """
         Initialize BiasAnalyzer
         
@@ -22,11 +61,51 @@ class BiasAnalyzer:
             df: pandas DataFrame
             target_col: name of target/outcome column
             protected_attributes: list of protected attribute column names
+            use_polars: run the aggregation-heavy passes on a Polars copy of df (needs polars)
+            copy: work on a private copy of df; the analyzer never modifies df, so by
+                  default it just keeps a reference
         """
-        self.df = df.copy()
         self.target_col = target_col
         self.protected_attributes = protected_attributes or []
+        self.df = self._compact_dtypes(df.copy() if copy else df)
+        # Whether the target exists and how to treat it never changes, so decide it once
+        self._has_target = bool(target_col) and target_col in self.df.columns
+        self._target_is_categorical = self._has_target and self.df[target_col].dtype.name in ('object', 'category')
         self.bias_report = {}
+        self._pl = self._to_polars(self.df) if use_polars else None
+        self._null_mask = None
+        self._col_stats = None
+        self._group_code_cache = {}
+        self._group_size_cache = {}
+        self._plot_writes = None
+        self._col_stats_lock = threading.Lock()
+    
+    def _compact_dtypes(self, df):
+        """Downcast integer columns and make text protected attributes categorical, without touching df"""
+        dtypes = {}
+        for col in df.columns:
+            dtype = df[col].dtype
+            if pd.api.types.is_integer_dtype(dtype):
+                smallest = pd.to_numeric(df[col], downcast='integer').dtype
+                if smallest != dtype:
+                    dtypes[col] = smallest
+            elif dtype == 'object' and col in self.protected_attributes and col != self.target_col:
+                dtypes[col] = 'category'
+        # astype returns a new frame, so the caller's DataFrame keeps its dtypes
+        return df.astype(dtypes, copy=False) if dtypes else df
+    
+    @staticmethod
+    def _to_polars(df):
+        """Convert df to a Polars DataFrame once, or return None to stay on pandas"""
+        if pl is None:
+            print("⚠️  Polars not installed - using pandas")
+            return None
+        try:
+            # NaN becomes null, so null counts match pandas' isnull()
+            return pl.from_pandas(df, nan_to_null=True)
+        except Exception as e:
+            print(f"⚠️  Could not convert dataset to Polars ({str(e)}) - using pandas")
+            return None
         
     def basic_statistics(self):
         """Show basic dataset statistics and class distributions"""
@@ -43,7 +122,7 @@ class BiasAnalyzer:
         print(self.df.dtypes.value_counts())
         
         # Target distribution if provided
-        if self.target_col and self.target_col in self.df.columns:
+        if self._has_target:
             print(f"\nTarget Variable ({self.target_col}) Distribution:")
             target_dist = self.df[self.target_col].value_counts(normalize=True)
             print(target_dist)
@@ -59,12 +138,13 @@ class BiasAnalyzer:
         print("MISSING VALUES ANALYSIS")
         print("="*60)
         
+        col_stats = self._column_stats()
         missing_stats = pd.DataFrame({
-            'Missing_Count': self.df.isnull().sum(),
-            'Missing_Percentage': (self.df.isnull().sum() / len(self.df)) * 100
+            'Missing_Count': col_stats['n_missing'],
+            'Missing_Percentage': col_stats['pct_missing']
         })
         missing_stats = missing_stats[missing_stats['Missing_Count'] > 0]
-        missing_stats = missing_stats.sort_values('Missing_Percentage', ascending=False)
+        missing_stats = missing_stats.sort_values('Missing_Percentage', ascending=False, kind='stable')
         
         if len(missing_stats) == 0:
             print("No missing values found!")
@@ -83,34 +163,49 @@ class BiasAnalyzer:
         return missing_stats
     
     def detect_class_imbalance(self, threshold=0.1):
-        """Detect columns with major class imbalance"""
+        """Detect columns with major class imbalance, skipping constant and all-distinct (ID) columns"""
         print("\n" + "="*60)
         print("CLASS IMBALANCE DETECTION")
         print("="*60)
         
         imbalanced_cols = {}
-        
-        for col in self.df.columns:
-            if self.df[col].dtype == 'object' or self.df[col].nunique() <= 10:
-                value_counts = self.df[col].value_counts(normalize=True)
-                
-                # Check if any class has less than threshold representation
-                min_class_ratio = value_counts.min()
-                max_class_ratio = value_counts.max()
+        report_lines = []
+        
+        # Text and categorical columns always qualify; the others only when they have at most 10 distinct values.
+        # A constant column has no imbalance to report and one with every value distinct is an identifier;
+        # both are dropped here when the distinct count is known, and after counting for text columns
+        col_stats = self._column_stats()
+        n_present = len(self.df) - col_stats['n_missing']
+        nunique = col_stats['nunique']
+        few_values = (nunique > 1) & (nunique <= 10) & (nunique < n_present)
+        candidates = col_stats.index[col_stats['is_text'] | few_values]
+        
+        for col in candidates:
+            # Unsorted counts are enough for the extremes; only flagged columns get sorted for the report
+            value_counts = self._value_counts(col, sort=False)
+            if len(value_counts) <= 1 or len(value_counts) == n_present[col]:
+                continue
+            
+            min_class_ratio = value_counts.min()
+            max_class_ratio = value_counts.max()
+            
+            # Check if any class has less than threshold representation
+            if min_class_ratio < threshold:
+                value_counts = value_counts.sort_values(ascending=False)
+                imbalanced_cols[col] = {
+                    'min_class_ratio': min_class_ratio,
+                    'max_class_ratio': max_class_ratio,
+                    'distribution': value_counts.to_dict()
+                }
                 
-                if min_class_ratio < threshold:
-                    imbalanced_cols[col] = {
-                        'min_class_ratio': min_class_ratio,
-                        'max_class_ratio': max_class_ratio,
-                        'distribution': value_counts.to_dict()
-                    }
-                    
-                    print(f"\n⚠️  IMBALANCE DETECTED in '{col}':")
-                    print(f"   Minority class: {min_class_ratio:.1%}")
-                    print(f"   Majority class: {max_class_ratio:.1%}")
-                    print("   Distribution:")
-                    for val, ratio in value_counts.items():
-                        print(f"     {val}: {ratio:.1%}")
+                report_lines.append(f"\n⚠️  IMBALANCE DETECTED in '{col}':")
+                report_lines.append(f"   Minority class: {min_class_ratio:.1%}")
+                report_lines.append(f"   Majority class: {max_class_ratio:.1%}")
+                report_lines.append("   Distribution:")
+                report_lines.extend(f"     {val}: {ratio:.1%}" for val, ratio in value_counts.items())
+        
+        if report_lines:
+            print("\n".join(report_lines))
         
         if not imbalanced_cols:
             print("No major class imbalances detected!")
@@ -118,6 +213,66 @@ class BiasAnalyzer:
         self.bias_report['class_imbalance'] = imbalanced_cols
         return imbalanced_cols
     
+    def _column_stats(self):
+        """Per-column dtype, missing and distinct counts shared by the analysis passes, computed once"""
+        # nunique is NaN for text columns; the frame is shared and must not be modified by callers
+        # missing_values_analysis and detect_class_imbalance may ask for this concurrently
+        with self._col_stats_lock:
+            if self._col_stats is not None:
+                return self._col_stats
+            
+            dtypes = self.df.dtypes
+            is_text = np.array([dtype == 'object' or dtype.name == 'category' for dtype in dtypes], dtype=bool)
+            other_cols = self.df.columns[~is_text]
+            if self._pl is not None:
+                # One multithreaded pass each for null and distinct counts (nulls excluded, as in pandas)
+                n_missing = self._pl.select(pl.all().null_count()).row(0)
+                n_unique = self._pl.lazy().select(
+                    [pl.col(col).drop_nulls().n_unique() for col in other_cols]).collect().row(0) if len(other_cols) else ()
+            else:
+                n_missing = self._missing_mask().sum(axis=0)
+                n_unique = self.df[other_cols].nunique().to_numpy()
+            
+            col_stats = pd.DataFrame({'dtype': dtypes, 'is_text': is_text}, index=self.df.columns)
+            col_stats['n_missing'] = np.asarray(n_missing, dtype='int64')
+            col_stats['pct_missing'] = (col_stats['n_missing'] / len(self.df)) * 100
+            col_stats['nunique'] = pd.Series(np.asarray(n_unique, dtype='float64'), index=other_cols)
+            self._col_stats = col_stats
+            return col_stats
+    
+    def _missing_mask(self):
+        """Boolean isnull() mask of df as an ndarray, computed once and shared between passes"""
+        if self._null_mask is None:
+            self._null_mask = self.df.isnull().to_numpy()
+        return self._null_mask
+    
+    def _value_counts(self, col, sort=True):
+        """Relative frequencies of col's non-null values, most frequent first when sort is set"""
+        if self._pl is None:
+            return self.df[col].value_counts(normalize=True, sort=sort)
+        
+        counts = self._pl.get_column(col).drop_nulls().value_counts(sort=sort)
+        values, freqs = counts.get_column(counts.columns[0]), counts.get_column(counts.columns[1])
+        total = freqs.sum()
+        return pd.Series((freqs / total).to_list() if total else [], index=values.to_list(),
+                         name='proportion', dtype='float64')
+    
+    def _group_target_means(self, protected_attr):
+        """Mean and count of the target per protected group, sorted by group (nulls dropped)"""
+        if self._pl is None:
+            return self.df.groupby(protected_attr)[self.target_col].agg(['mean', 'count'])
+        
+        groups = (self._pl.lazy()
+                  .filter(pl.col(protected_attr).is_not_null())
+                  .group_by(protected_attr)
+                  .agg([pl.col(self.target_col).mean().alias('mean'),
+                        pl.col(self.target_col).count().alias('count')])
+                  .sort(protected_attr)
+                  .collect()
+                  .to_dict(as_series=False))
+        return pd.DataFrame({'mean': groups['mean'], 'count': groups['count']},
+                            index=pd.Index(groups[protected_attr], name=protected_attr))
+    
     def protected_attribute_analysis(self):
         """Analyze protected attributes for bias"""
         if not self.protected_attributes:
@@ -136,52 +291,45 @@ class BiasAnalyzer:
             print(f"\nAnalyzing protected attribute: {attr}")
             
             # Distribution of protected attribute
-            attr_dist = self.df[attr].value_counts(normalize=True)
+            attr_counts = self._group_sizes(attr)
+            attr_dist = attr_counts / attr_counts.sum()
             print(f"Distribution:")
             for val, ratio in attr_dist.items():
                 print(f"  {val}: {ratio:.1%}")
             
             # If target column exists, check for bias
-            if self.target_col and self.target_col in self.df.columns:
+            if self._has_target:
                 self._check_statistical_parity(attr)
                 self._check_equalized_odds(attr)
     
     def _check_statistical_parity(self, protected_attr):
         """Check for statistical parity bias"""
-        if self.target_col not in self.df.columns:
+        if not self._has_target:
             return
         
         print(f"\n  Statistical Parity Analysis for {protected_attr}:")
         
-        # Check if target column is categorical or numeric
-        target_dtype = self.df[self.target_col].dtype
-        is_categorical = target_dtype == 'object' or target_dtype.name == 'category'
-        
-        if is_categorical:
+        if self._target_is_categorical:
             # For categorical targets, analyze distribution differences
             print(f"    Target column '{self.target_col}' is categorical - analyzing distribution differences")
             
-            # Get value counts for each group
-            group_distributions = {}
-            for group_val in self.df[protected_attr].unique():
-                group_data = self.df[self.df[protected_attr] == group_val]
-                group_distributions[group_val] = group_data[self.target_col].value_counts(normalize=True)
+            # Target category shares for every group in one crosstab
+            distributions = self._target_distribution(protected_attr)
+            if distributions.empty:
+                print("    No groups with target values to compare")
+                return
             
             # Find the most common category for each group
-            most_common_by_group = {}
-            for group_val, dist in group_distributions.items():
-                most_common = dist.idxmax()
-                most_common_rate = dist.max()
-                most_common_by_group[group_val] = (most_common, most_common_rate)
-                print(f"    {group_val}: {most_common} ({most_common_rate:.1%})")
+            most_common = distributions.idxmax(axis=1)
+            rates = distributions.max(axis=1)
+            print("\n".join(f"    {group_val}: {most_common[group_val]} ({rates[group_val]:.1%})"
+                            for group_val in distributions.index))
             
             # Calculate distribution difference for the most common category
-            rates = [rate for _, rate in most_common_by_group.values()]
-            max_rate = max(rates)
-            min_rate = min(rates)
-            parity_diff = max_rate - min_rate
+            parity_diff = rates.max() - rates.min()
             
             print(f"    Distribution Difference: {parity_diff:.3f}")
+            self.bias_report.setdefault('parity', {})[protected_attr] = float(parity_diff)
             
             if parity_diff > 0.2:  # 20% threshold for categorical data
                 print("    ⚠️  BIAS DETECTED: Significant difference in category distributions")
@@ -190,10 +338,11 @@ class BiasAnalyzer:
         else:
             # For numeric targets, calculate mean rates
             try:
-                groups = self.df.groupby(protected_attr)[self.target_col].agg(['mean', 'count'])
+                groups = self._group_target_means(protected_attr)
                 
-                for group_val, row in groups.iterrows():
-                    print(f"    {group_val}: {row['mean']:.1%} positive rate (n={row['count']})")
+                if len(groups):
+                    print("\n".join(f"    {group_val}: {mean:.1%} positive rate (n={count})"
+                                    for group_val, mean, count in zip(groups.index, groups['mean'], groups['count'])))
                 
                 # Calculate statistical parity difference
                 rates = groups['mean']
@@ -202,6 +351,7 @@ class BiasAnalyzer:
                 parity_diff = max_rate - min_rate
                 
                 print(f"    Statistical Parity Difference: {parity_diff:.3f}")
+                self.bias_report.setdefault('parity', {})[protected_attr] = float(parity_diff)
                 
                 if parity_diff > 0.1:  # 10% threshold
                     print("    ⚠️  BIAS DETECTED: Significant difference in positive rates")
@@ -211,6 +361,44 @@ class BiasAnalyzer:
                 print(f"    ❌ Error in statistical parity analysis: {str(e)}")
                 print("    Skipping this analysis due to data type incompatibility")
     
+    def _parity_difference(self, protected_attr, is_categorical):
+        """Spread of the target rate across protected groups, or None if it cannot be computed"""
+        if is_categorical:
+            # Rate of each group's most common target category
+            most_common_rates = self._target_distribution(protected_attr).max(axis=1).to_numpy()
+            if not len(most_common_rates):
+                return None
+            return most_common_rates.max() - most_common_rates.min()
+        
+        groups = self._group_target_means(protected_attr)
+        if len(groups) <= 1:
+            return None
+        rates = groups['mean']
+        return rates.max() - rates.min()
+    
+    def _target_distribution(self, protected_attr):
+        """Share of each target category within each group, groups in order of appearance"""
+        codes, groups = self._group_codes(protected_attr)
+        distributions = pd.crosstab(pd.Series(codes, index=self.df.index, name=protected_attr),
+                                    self.df[self.target_col], normalize='index')
+        # Rows come out sorted by code, i.e. in order of appearance; groups without target values are absent
+        distributions.index = groups.take(distributions.index)
+        # Rows with a missing protected attribute do not form a group
+        return distributions[distributions.index.notna()]
+    
+    def _group_sizes(self, protected_attr):
+        """Row count of each protected group, largest first; counted once and shared with the plots"""
+        if protected_attr not in self._group_size_cache:
+            self._group_size_cache[protected_attr] = self.df[protected_attr].value_counts()
+        return self._group_size_cache[protected_attr]
+    
+    def _group_codes(self, protected_attr):
+        """Integer codes and group values of protected_attr in order of appearance, factorized once"""
+        if protected_attr not in self._group_code_cache:
+            # Missing values get a code of their own so the groups line up with unique()
+            self._group_code_cache[protected_attr] = pd.factorize(self.df[protected_attr], use_na_sentinel=False)
+        return self._group_code_cache[protected_attr]
+    
     def _check_equalized_odds(self, protected_attr):
         """Check for equalized odds bias (if predictions available)"""
         # This would require prediction data - placeholder for now
@@ -232,26 +420,48 @@ class BiasAnalyzer:
                 
             print(f"\nFairness metrics for {attr}:")
             
-            for group_val in self.df[attr].unique():
-                group_data = self.df[self.df[attr] == group_val]
-                
-                if self.target_col in self.df.columns:
-                    # True Positive Rate
-                    tpr = ((group_data[predictions_col] == 1) & 
-                           (group_data[self.target_col] == 1)).sum() / \
-                          (group_data[self.target_col] == 1).sum()
-                    
-                    # False Positive Rate  
-                    fpr = ((group_data[predictions_col] == 1) & 
-                           (group_data[self.target_col] == 0)).sum() / \
-                          (group_data[self.target_col] == 0).sum()
-                    
-                    print(f"  {group_val}:")
-                    print(f"    True Positive Rate: {tpr:.3f}")
-                    print(f"    False Positive Rate: {fpr:.3f}")
+            if not self._has_target:
+                continue
+            
+            # One confusion-matrix count per group: rows are groups, columns (actual, predicted)
+            cm = self._confusion_counts(attr, predictions_col)
+            tpr = cm[(1, 1)] / (cm[(1, 1)] + cm[(1, 0)])
+            fpr = cm[(0, 1)] / (cm[(0, 1)] + cm[(0, 0)])
+            
+            report_lines = []
+            for group_val in cm.index:
+                report_lines.append(f"  {group_val}:")
+                report_lines.append(f"    True Positive Rate: {tpr[group_val]:.3f}")
+                report_lines.append(f"    False Positive Rate: {fpr[group_val]:.3f}")
+            if report_lines:
+                print("\n".join(report_lines))
+    
+    def _confusion_counts(self, protected_attr, predictions_col):
+        """Count (actual, predicted) outcome pairs per group in a single pass"""
+        actual = self.df[self.target_col]
+        actual = np.select([actual == 1, actual == 0], [1, 0], -1).astype('int8')
+        predicted = (self.df[predictions_col] == 1).to_numpy(dtype='int8')
+        confusion_columns = pd.MultiIndex.from_product([[1, 0], [1, 0]])
+        
+        group_ids, groups = self._group_codes(protected_attr)
+        if _count_confusion_jit is not None:
+            counts = _count_confusion_jit(group_ids, actual, predicted, len(groups))
+        else:
+            # Each row falls in exactly one (group, actual, predicted) cell, so a histogram of the
+            # packed cell index gives all per-group TP/FN/FP/TN counts in one vectorized pass
+            cells = group_ids * 4 + actual * 2 + predicted
+            if (actual < 0).any():
+                cells = cells[actual >= 0]  # non-binary labels count nowhere
+            counts = np.bincount(cells, minlength=len(groups) * 4).reshape(len(groups), 2, 2)
+        # counts[g, a, p] is ordered 0/1; flip both axes to match confusion_columns
+        cm = pd.DataFrame(counts[:, ::-1, ::-1].reshape(len(groups), 4),
+                          index=groups, columns=confusion_columns)
+        # The missing-value group is reported, but with no counts (so NaN rates)
+        cm.loc[groups.isna()] = 0
+        return cm
     
-    def create_bias_visualizations(self):
-        """Create visualizations for bias analysis"""
+    def create_bias_visualizations(self, out_dir='.', dpi=300):
+        """Create visualizations for bias analysis, saving the plots into out_dir"""
         print("\n" + "="*60)
         print("GENERATING BIAS VISUALIZATIONS")
         print("="*60)
@@ -262,7 +472,7 @@ class BiasAnalyzer:
         
         # Calculate number of subplots needed
         n_plots = 1  # Missing values plot
-        if self.target_col and self.target_col in self.df.columns:
+        if self._has_target:
             n_plots += 1  # Target distribution
         n_plots += len(self.protected_attributes)  # Protected attributes
         
@@ -274,11 +484,24 @@ class BiasAnalyzer:
         
         # 1. Missing values heatmap
         if plot_idx < len(axes):
-            missing_data = self.df.isnull()
-            if missing_data.any().any():
+            null_mask = self._missing_mask()
+            has_missing = null_mask.any()
+            if has_missing and len(self.df) <= MISSING_HEATMAP_MAX_ROWS:
+                # Wrap the cached mask without copying so seaborn still labels the columns
+                missing_data = pd.DataFrame(null_mask, index=self.df.index,
+                                            columns=self.df.columns, copy=False)
                 sns.heatmap(missing_data, yticklabels=False, cbar=True, 
                            cmap='viridis', ax=axes[plot_idx])
                 axes[plot_idx].set_title('Missing Values Heatmap')
+            elif has_missing:
+                # A cell-per-row heatmap is too costly here; plot each column's missing share instead
+                missing_pct = pd.Series(null_mask.sum(axis=0) * 100 / len(self.df), index=self.df.columns)
+                missing_pct = missing_pct[missing_pct > 0].sort_values(ascending=False)
+                axes[plot_idx].bar(range(len(missing_pct)), missing_pct.values)
+                axes[plot_idx].set_xticks(range(len(missing_pct)))
+                axes[plot_idx].set_xticklabels(missing_pct.index, rotation=45)
+                axes[plot_idx].set_title('Missing Values by Column')
+                axes[plot_idx].set_ylabel('Missing (%)')
             else:
                 axes[plot_idx].text(0.5, 0.5, 'No Missing Values', 
                                   transform=axes[plot_idx].transAxes, 
@@ -287,7 +510,7 @@ class BiasAnalyzer:
             plot_idx += 1
         
         # 2. Target distribution
-        if self.target_col and self.target_col in self.df.columns and plot_idx < len(axes):
+        if self._has_target and plot_idx < len(axes):
             target_counts = self.df[self.target_col].value_counts()
             axes[plot_idx].pie(target_counts.values, labels=target_counts.index, 
                               autopct='%1.1f%%', startangle=90)
@@ -297,7 +520,7 @@ class BiasAnalyzer:
         # 3. Protected attributes analysis
         for attr in self.protected_attributes[:2]:  # Limit to first 2 for space
             if attr in self.df.columns and plot_idx < len(axes):
-                attr_counts = self.df[attr].value_counts()
+                attr_counts = self._group_sizes(attr)
                 axes[plot_idx].bar(range(len(attr_counts)), attr_counts.values)
                 axes[plot_idx].set_xticks(range(len(attr_counts)))
                 axes[plot_idx].set_xticklabels(attr_counts.index, rotation=45)
@@ -310,20 +533,37 @@ class BiasAnalyzer:
             axes[i].set_visible(False)
         
         plt.tight_layout()
-        plt.savefig('bias_analysis_report.png', dpi=300, bbox_inches='tight')
-        plt.show()
+        figures = [(fig, os.path.join(out_dir, 'bias_analysis_report.png'))]
         
         # Additional correlation heatmap for numerical features
         numerical_cols = self.df.select_dtypes(include=[np.number]).columns
         if len(numerical_cols) > 1:
-            plt.figure(figsize=(10, 8))
-            correlation_matrix = self.df[numerical_cols].corr()
+            corr_fig = plt.figure(figsize=(10, 8))
+            correlation_matrix = self._correlation_matrix(numerical_cols)
             sns.heatmap(correlation_matrix, annot=True, cmap='coolwarm', center=0,
                        square=True, fmt='.2f')
             plt.title('Feature Correlation Matrix')
             plt.tight_layout()
-            plt.savefig('correlation_heatmap.png', dpi=300, bbox_inches='tight')
-            plt.show()
+            figures.append((corr_fig, os.path.join(out_dir, 'correlation_heatmap.png')))
+        
+        # The figures are fully laid out, so drop them from pyplot and let the writer thread
+        # render the PNGs while the caller moves on (see wait_for_visualizations)
+        for figure, _ in figures:
+            plt.close(figure)
+        self._plot_writes = PLOT_WRITER.submit(_save_figures, figures, dpi)
+    
+    def wait_for_visualizations(self):
+        """Block until the PNGs from create_bias_visualizations are written, re-raising any error"""
+        if self._plot_writes is not None:
+            self._plot_writes.result()
+    
+    def _correlation_matrix(self, columns):
+        """Pearson correlation of the given numeric columns"""
+        values = self.df[columns].to_numpy(dtype=np.float64)
+        if np.isnan(values).any():
+            # pandas drops missing values pair by pair, which np.corrcoef cannot do
+            return self.df[columns].corr()
+        return pd.DataFrame(np.corrcoef(values, rowvar=False), index=columns, columns=columns)
     
     def calculate_bias_score_with_reasoning(self):
         """Calculate bias score and provide detailed reasoning"""
@@ -333,17 +573,16 @@ class BiasAnalyzer:
         # Factor 1: Missing Values Impact (up to 25 points)
         missing_penalty = 0
         if 'missing_values' in self.bias_report:
-            high_missing_cols = []
-            for col, pct in self.bias_report['missing_values']['Missing_Percentage'].items():
-                if pct > 20:
-                    high_missing_cols.append((col, pct))
-                    missing_penalty += min(5, pct / 4)  # Up to 5 points per column
+            # Flag columns with one vectorized comparison, then walk only the flagged ones,
+            # worst first as in the missing-values report
+            pct_missing = self._column_stats()['pct_missing']
+            high_missing = pct_missing[pct_missing.to_numpy() > 20].sort_values(ascending=False, kind='stable')
+            missing_penalty = sum(min(5, pct / 4) for pct in high_missing)  # Up to 5 points per column
             
-            if high_missing_cols:
+            if len(high_missing):
                 reasoning.append(f"Missing Values: -{missing_penalty:.1f} points")
                 reasoning.append("  • High missing values can introduce bias by excluding certain groups")
-                for col, pct in high_missing_cols:
-                    reasoning.append(f"    - {col}: {pct:.1f}% missing values")
+                reasoning.extend(f"    - {col}: {pct:.1f}% missing values" for col, pct in high_missing.items())
         
         bias_score -= missing_penalty
         
@@ -382,49 +621,34 @@ class BiasAnalyzer:
             for attr in self.protected_attributes:
                 if attr in self.df.columns:
                     try:
-                        # Check if target column is categorical or numeric
-                        target_dtype = self.df[self.target_col].dtype
-                        is_categorical = target_dtype == 'object' or target_dtype.name == 'category'
+                        is_categorical = self._target_is_categorical
+                        
+                        # Reuse the difference _check_statistical_parity already computed
+                        parity_diff = self.bias_report.get('parity', {}).get(attr)
+                        if parity_diff is None:
+                            parity_diff = self._parity_difference(attr, is_categorical)
+                        
+                        if parity_diff is None:
+                            continue
                         
                         if is_categorical:
-                            # For categorical targets, analyze distribution differences
-                            group_distributions = {}
-                            for group_val in self.df[attr].unique():
-                                group_data = self.df[self.df[attr] == group_val]
-                                group_distributions[group_val] = group_data[self.target_col].value_counts(normalize=True)
-                            
-                            # Find the most common category for each group
-                            most_common_rates = []
-                            for group_val, dist in group_distributions.items():
-                                most_common_rate = dist.max()
-                                most_common_rates.append(most_common_rate)
-                            
-                            if most_common_rates:
-                                parity_diff = max(most_common_rates) - min(most_common_rates)
-                                
-                                if parity_diff > 0.3:  # Severe bias for categorical
-                                    protected_penalty += 10
-                                    reasoning.append(f"Protected Attribute Bias ({attr}): -10 points")
-                                    reasoning.append(f"  • Severe distribution bias detected: {parity_diff:.3f}")
-                                elif parity_diff > 0.2:  # Moderate bias for categorical
-                                    protected_penalty += 5
-                                    reasoning.append(f"Protected Attribute Bias ({attr}): -5 points")
-                                    reasoning.append(f"  • Moderate distribution bias detected: {parity_diff:.3f}")
+                            if parity_diff > 0.3:  # Severe bias for categorical
+                                protected_penalty += 10
+                                reasoning.append(f"Protected Attribute Bias ({attr}): -10 points")
+                                reasoning.append(f"  • Severe distribution bias detected: {parity_diff:.3f}")
+                            elif parity_diff > 0.2:  # Moderate bias for categorical
+                                protected_penalty += 5
+                                reasoning.append(f"Protected Attribute Bias ({attr}): -5 points")
+                                reasoning.append(f"  • Moderate distribution bias detected: {parity_diff:.3f}")
                         else:
-                            # For numeric targets, calculate mean rates
-                            groups = self.df.groupby(attr)[self.target_col].agg(['mean', 'count'])
-                            if len(groups) > 1:
-                                rates = groups['mean']
-                                parity_diff = rates.max() - rates.min()
-                                
-                                if parity_diff > 0.2:  # Severe bias
-                                    protected_penalty += 10
-                                    reasoning.append(f"Protected Attribute Bias ({attr}): -10 points")
-                                    reasoning.append(f"  • Severe statistical parity bias detected: {parity_diff:.3f}")
-                                elif parity_diff > 0.1:  # Moderate bias
-                                    protected_penalty += 5
-                                    reasoning.append(f"Protected Attribute Bias ({attr}): -5 points")
-                                    reasoning.append(f"  • Moderate statistical parity bias detected: {parity_diff:.3f}")
+                            if parity_diff > 0.2:  # Severe bias
+                                protected_penalty += 10
+                                reasoning.append(f"Protected Attribute Bias ({attr}): -10 points")
+                                reasoning.append(f"  • Severe statistical parity bias detected: {parity_diff:.3f}")
+                            elif parity_diff > 0.1:  # Moderate bias
+                                protected_penalty += 5
+                                reasoning.append(f"Protected Attribute Bias ({attr}): -5 points")
+                                reasoning.append(f"  • Moderate statistical parity bias detected: {parity_diff:.3f}")
                     except Exception as e:
                         # Skip this attribute if analysis fails
                         reasoning.append(f"Protected Attribute Analysis ({attr}): Skipped due to data type incompatibility")
@@ -483,8 +707,7 @@ class BiasAnalyzer:
         
         print("Detailed Reasoning:")
         if bias_analysis['reasoning']:
-            for reason in bias_analysis['reasoning']:
-                print(f"  {reason}")
+            print("\n".join(f"  {reason}" for reason in bias_analysis['reasoning']))
         else:
             print("  • No significant bias factors detected")
         
@@ -512,8 +735,7 @@ class BiasAnalyzer:
         
         if risk_factors:
             print("\nRisk Factors Identified:")
-            for factor in risk_factors:
-                print(f"  • {factor}")
+            print("\n".join(f"  • {factor}" for factor in risk_factors))
         
         print("\nRecommendations:")
         if risk_level == "HIGH":
@@ -535,6 +757,15 @@ class BiasAnalyzer:
         
         return self.bias_report
 
+def load_csv(csv_file, use_polars=False):
+    """Read a CSV into pandas, through Polars' multithreaded streaming reader when requested"""
+    if use_polars and pl is not None:
+        try:
+            return pl.scan_csv(csv_file).collect(streaming=True).to_pandas()
+        except Exception as e:
+            print(f"⚠️  Polars could not read the CSV ({str(e)}) - using pandas")
+    return pd.read_csv(csv_file)
+
 def main():
     """Main function to run bias analysis"""
     import argparse
@@ -544,17 +775,21 @@ def main():
     parser.add_argument('--target', help='Target column name')
     parser.add_argument('--protected', nargs='+', help='Protected attribute column names')
     parser.add_argument('--predictions', help='Predictions column name (if available)')
+    parser.add_argument('--polars', action='store_true', help='Read the CSV and run aggregations with Polars (if installed)')
     
     args = parser.parse_args()
     
+    # Plots are only written to disk, so skip any interactive backend
+    plt.switch_backend('Agg')
+    
     try:
         # Load data
         print(f"Loading data from {args.csv_file}...")
-        df = pd.read_csv(args.csv_file)
+        df = load_csv(args.csv_file, use_polars=args.polars)
         
         # Initialize analyzer
         analyzer = BiasAnalyzer(df, target_col=args.target, 
-                               protected_attributes=args.protected)
+                               protected_attributes=args.protected, use_polars=args.polars)
         
         # Run analysis
         analyzer.basic_statistics()
@@ -567,6 +802,7 @@ def main():
         
         analyzer.create_bias_visualizations()
         analyzer.generate_bias_report()
+        analyzer.wait_for_visualizations()
         
         print(f"\n✓ Analysis complete! Visualizations saved as PNG files.")
         
@@ -4,25 +4,157 @@ Dataset Fingerprinting Script for Ethical AI Governance Toolkit
 Generates unique SHA-256 hash and comprehensive schema summary for datasets
 """
 
-import pandas as pd
-import numpy as np
 import hashlib
 import json
+import mmap
 import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import argparse
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+# pandas, numpy and numbagg are imported by _import_dataframe_libs() on first use, so the CLI
+# parses arguments (and answers --help) without paying their import cost
+pd = None
+np = None
+numbagg = None
+
+HASH_CHUNK_SIZE = 1024 * 1024  # 1MB reads keep hashing I/O-bound rather than call-bound
+# Bumped whenever a hash in the fingerprint changes definition, so cached fingerprints can be told apart
+GENERATOR_VERSION = '1.3.0'
+TREE_HASH_CHUNK_SIZE = 64 * 1024 * 1024  # leaf size of the parallel tree hash; a multiple of mmap's granularity
+# Local cache of CLI fingerprints, keyed by path, size, mtime and a hash of the file's first bytes
+FINGERPRINT_CACHE_DIR = Path(os.environ.get('EAIGT_CACHE_DIR', Path.home() / '.cache' / 'eaigt' / 'fingerprints'))
+CACHE_HEAD_BYTES = 4096
+# Files larger than this skip the content hash unless it is requested explicitly
+CONTENT_HASH_MAX_BYTES = 100 * 1024 * 1024
+
+def _hash_file_range(file_path, start, length):
+    """SHA-256 digest of length bytes of file_path starting at start (a tree-hash leaf)"""
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), length, access=mmap.ACCESS_READ, offset=start) as mapped:
+        # hashlib drops the GIL while hashing large buffers, so leaves hash in parallel on threads
+        return hashlib.sha256(mapped).digest()
+
+def _import_dataframe_libs():
+    """Import pandas, numpy and (when installed) numbagg into the module namespace"""
+    global pd, np, numbagg
+    if pd is not None:
+        return
+    import pandas
+    import numpy
+    try:
+        import numbagg as numbagg_module
+    except ImportError:
+        numbagg_module = None
+    # pd is the "already imported" flag, so it is published last; a concurrent caller that
+    # sees it set can rely on np and numbagg being set too
+    np = numpy
+    numbagg = numbagg_module
+    pd = pandas
+
+def _is_numerical_dtype(dtype):
+    """Real-valued numeric dtypes of any width (and nullable variants); bools are summarized separately"""
+    types = pd.api.types
+    return types.is_numeric_dtype(dtype) and not types.is_bool_dtype(dtype) and not types.is_complex_dtype(dtype)
+
+def _column_kind(dtype):
+    """Which analyze_schema branch summarizes a column of this dtype (None: generic counts only)"""
+    if _is_numerical_dtype(dtype):
+        return 'numerical'
+    if pd.api.types.is_object_dtype(dtype):
+        return 'object'
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return 'datetime'
+    if pd.api.types.is_bool_dtype(dtype):
+        return 'bool'
+    return None
+
+def _numerical_stats(frame):
+    """min/max/mean/median/std/quartiles of every column of an all-numeric frame, one row per column"""
+    if numbagg is not None:
+        try:
+            # numbagg's nan-aware kernels reduce the whole 2-D block in parallel, one pass per statistic
+            arr = frame.to_numpy(dtype=np.float64, na_value=np.nan)
+            q25, median, q75 = numbagg.nanquantile(arr, [0.25, 0.5, 0.75], axis=0)
+            return pd.DataFrame({
+                'min': numbagg.nanmin(arr, axis=0),
+                'max': numbagg.nanmax(arr, axis=0),
+                'mean': numbagg.nanmean(arr, axis=0),
+                'median': median,
+                'std': numbagg.nanstd(arr, axis=0, ddof=1),
+                '25%': q25,
+                '75%': q75
+            }, index=frame.columns)
+        except Exception as e:
+            print(f"⚠️  numbagg aggregation failed ({str(e)}), falling back to pandas")
+    
+    # describe() gives min/max/mean/std/quartiles per column; median() matches Series.median exactly
+    stats = frame.describe().T
+    stats['median'] = frame.median()
+    return stats
+
+def _top_value_counts(series, k=5):
+    """The k most frequent non-null values of series with their counts, ties in order of first appearance"""
+    codes, uniques = pd.factorize(series)
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    if len(counts) > k:
+        # Only values reaching the k-th largest count can make the cut, so the full histogram is never sorted
+        kth_count = np.partition(counts, len(counts) - k)[len(counts) - k]
+        candidates = np.flatnonzero(counts >= kth_count)
+    else:
+        candidates = np.arange(len(counts))
+    top = candidates[np.argsort(-counts[candidates], kind='stable')[:k]]
+    return zip(uniques.take(top), counts[top])
+
+class StreamingFileHasher:
+    """Compute a file's SHA-256 hash and dataset id incrementally, e.g. while it is being written"""
+    
+    def __init__(self):
+        self.sha256 = hashlib.sha256()
+        self.blake3 = blake3.blake3(max_threads=blake3.blake3.AUTO) if blake3 is not None else None
+    
+    def update(self, chunk):
+        self.sha256.update(chunk)
+        if self.blake3 is not None:
+            self.blake3.update(chunk)
+    
+    def file_hash(self):
+        """SHA-256 hex digest, as reported in the fingerprint"""
+        return self.sha256.hexdigest()
+    
+    def file_id(self):
+        """Same identifier DatasetFingerprinter.generate_file_id() produces for the file"""
+        if self.blake3 is not None:
+            return f"blake3_{self.blake3.hexdigest()}"
+        return f"sha256_{self.file_hash()}"
+
 class DatasetFingerprinter:
-    def __init__(self, file_path):
+    def __init__(self, file_path, content_hash=None):
         """
         Initialize DatasetFingerprinter
         
         Args:
             file_path: Path to the dataset file
+            content_hash: Compute the order-independent content hash (True/False);
+                None computes it only for files up to CONTENT_HASH_MAX_BYTES
         """
+        _import_dataframe_libs()
         self.file_path = Path(file_path)
+        self.content_hash = content_hash
         self.df = None
+        self.file_hash = None
+        self.file_id = None
         self.fingerprint_data = {}
         
     def load_dataset(self):
@@ -30,13 +162,19 @@ class DatasetFingerprinter:
         try:
             # Determine file type and load accordingly
             if self.file_path.suffix.lower() == '.csv':
-                self.df = pd.read_csv(self.file_path)
+                # pyarrow's CSV reader is multithreaded; fall back to the C engine if it is
+                # missing or rejects the file
+                try:
+                    self.df = pd.read_csv(self.file_path, engine='pyarrow')
+                except (ImportError, ValueError):
+                    self.df = pd.read_csv(self.file_path)
             elif self.file_path.suffix.lower() in ['.xlsx', '.xls']:
                 self.df = pd.read_excel(self.file_path)
             elif self.file_path.suffix.lower() == '.json':
                 self.df = pd.read_json(self.file_path)
             elif self.file_path.suffix.lower() == '.parquet':
-                self.df = pd.read_parquet(self.file_path)
+                # Memory-map the file so pyarrow decodes pages without first copying it into memory
+                self.df = pd.read_parquet(self.file_path, engine='pyarrow', memory_map=True)
             else:
                 raise ValueError(f"Unsupported file format: {self.file_path.suffix}")
                 
@@ -47,33 +185,82 @@ class DatasetFingerprinter:
             raise Exception(f"Error loading dataset: {str(e)}")
     
     def generate_file_hash(self):
-        """Generate SHA-256 hash of the file"""
-        sha256_hash = hashlib.sha256()
+        """Generate SHA-256 hash of the file (computed once per instance)"""
+        if self.file_hash is not None:
+            return self.file_hash
         
         try:
             with open(self.file_path, "rb") as f:
-                # Read file in chunks to handle large files
-                for chunk in iter(lambda: f.read(4096), b""):
-                    sha256_hash.update(chunk)
+                if hasattr(hashlib, 'file_digest'):
+                    # Python 3.11+: OpenSSL hashes straight from a reused buffer (readinto, GIL released)
+                    sha256_hash = hashlib.file_digest(f, 'sha256')
+                else:
+                    sha256_hash = hashlib.sha256()
+                    buffer = bytearray(HASH_CHUNK_SIZE)
+                    view = memoryview(buffer)
+                    # Read file in chunks into one buffer to handle large files
+                    while True:
+                        size = f.readinto(buffer)
+                        if not size:
+                            break
+                        sha256_hash.update(view[:size])
             
-            file_hash = sha256_hash.hexdigest()
-            print(f"✓ SHA-256 hash generated: {file_hash[:16]}...")
+            self.file_hash = sha256_hash.hexdigest()
+            print(f"✓ SHA-256 hash generated: {self.file_hash[:16]}...")
             
-            return file_hash
+            return self.file_hash
             
         except Exception as e:
             raise Exception(f"Error generating file hash: {str(e)}")
     
+    def generate_file_hash_parallel(self, n_workers=None, chunk_size=TREE_HASH_CHUNK_SIZE):
+        """Parallel SHA-256 tree hash of the file
+        
+        Each chunk_size slice is hashed on its own thread, then the final digest is
+        SHA-256(leaf digests || file size as little-endian uint64). This is a tree hash in the
+        spirit of NIST SP 800-185 ParallelHash, NOT the plain SHA-256 of the file, and it
+        depends on chunk_size, so the chunk size must be recorded alongside it.
+        """
+        if chunk_size % mmap.ALLOCATIONGRANULARITY:
+            raise ValueError(f"chunk_size must be a multiple of {mmap.ALLOCATIONGRANULARITY}")
+        
+        try:
+            file_size = os.path.getsize(self.file_path)
+            ranges = [(start, min(chunk_size, file_size - start)) for start in range(0, file_size, chunk_size)]
+            with ThreadPoolExecutor(max_workers=n_workers or os.cpu_count()) as executor:
+                leaves = list(executor.map(lambda r: _hash_file_range(self.file_path, *r), ranges))
+            
+            tree_hash = hashlib.sha256(b''.join(leaves) + struct.pack('<Q', file_size)).hexdigest()
+            print(f"✓ SHA-256 tree hash generated ({len(leaves)} chunks): {tree_hash[:16]}...")
+            return tree_hash
+            
+        except Exception as e:
+            raise Exception(f"Error generating file hash: {str(e)}")
+    
+    def generate_file_id(self):
+        """Fast non-cryptographic dataset identifier: multithreaded BLAKE3 when installed, else SHA-256"""
+        if self.file_id is not None:
+            return self.file_id
+        
+        if blake3 is not None:
+            digest = blake3.blake3(max_threads=blake3.blake3.AUTO).update_mmap(str(self.file_path)).hexdigest()
+            self.file_id = f"blake3_{digest}"
+        else:
+            self.file_id = f"sha256_{self.generate_file_hash()}"
+        return self.file_id
+    
     def generate_content_hash(self):
         """Generate SHA-256 hash of the actual data content (order-independent)"""
         try:
             # Sort columns and rows for consistent hashing
             sorted_df = self.df.reindex(sorted(self.df.columns), axis=1)
+            sorted_df = sorted_df.apply(self._canonical_column)
             sorted_df = sorted_df.sort_values(by=sorted_df.columns.tolist()).reset_index(drop=True)
             
-            # Convert to string representation
-            content_string = sorted_df.to_string(index=False)
-            content_hash = hashlib.sha256(content_string.encode()).hexdigest()
+            # Hash each column's typed bytes instead of formatting the whole frame as text,
+            # then combine the per-column digests
+            column_digests = [self._column_digest(name, sorted_df[name]) for name in sorted_df.columns]
+            content_hash = hashlib.sha256(b''.join(column_digests)).hexdigest()
             
             print(f"✓ Content hash generated: {content_hash[:16]}...")
             return content_hash
@@ -82,6 +269,33 @@ class DatasetFingerprinter:
             print(f"⚠️  Warning: Could not generate content hash: {str(e)}")
             return None
     
+    @staticmethod
+    def _canonical_column(col):
+        """Column as it is hashed: datetimes become their text (missing stays NaN)"""
+        # Whether a reader parses dates (pyarrow) or leaves them as strings (the C engine)
+        # must not change the content hash, so datetimes are hashed like the strings they came from
+        if pd.api.types.is_datetime64_any_dtype(col.dtype):
+            return col.astype(str).where(col.notna())
+        return col
+    
+    @staticmethod
+    def _column_digest(name, col):
+        """SHA-256 of a column's name and values, hashing numeric buffers directly"""
+        h = hashlib.sha256()
+        h.update(str(name).encode())
+        # Buffers are hashed in place through a uint8 view; tobytes() would copy every column first.
+        # Only the value layout is tagged, not the inferred dtype name
+        if isinstance(col.dtype, np.dtype) and col.dtype.kind in 'biufcm':
+            h.update(b'values' + col.dtype.str.encode())
+            h.update(np.ascontiguousarray(col.to_numpy()).view(np.uint8))
+        else:
+            # Strings and extension types: integer codes (-1 for missing) plus the distinct values in code order
+            codes, uniques = pd.factorize(col)
+            h.update(b'text')
+            h.update(np.ascontiguousarray(codes, dtype=np.int64).view(np.uint8))
+            h.update('\x00'.join(map(str, uniques)).encode())
+        return h.digest()
+    
     def analyze_schema(self):
         """Analyze dataset schema and structure"""
         schema_info = {
@@ -92,72 +306,102 @@ class DatasetFingerprinter:
         
         print("✓ Analyzing dataset schema...")
         
-        # Column analysis
-        for col in self.df.columns:
+        # Whole-frame aggregates, computed once instead of per column and per use
+        n_rows = len(self.df)
+        n_cols = len(self.df.columns)
+        non_null = self.df.count()
+        nulls = self.df.isnull().sum()
+        n_unique = self.df.nunique()
+        
+        # Classify every column once, then reduce each dtype group in a single frame-level call
+        column_kinds = {col: _column_kind(dtype) for col, dtype in self.df.dtypes.items()}
+        kind_cols = {kind: [col for col, col_kind in column_kinds.items() if col_kind == kind]
+                     for kind in ('numerical', 'datetime', 'bool')}
+        if kind_cols['numerical']:
+            numerical_stats = _numerical_stats(self.df[kind_cols['numerical']])
+        if kind_cols['datetime']:
+            min_dates = self.df[kind_cols['datetime']].min()
+            max_dates = self.df[kind_cols['datetime']].max()
+        if kind_cols['bool']:
+            true_counts = self.df[kind_cols['bool']].sum()
+        
+        # Column analysis; the per-column work is pandas/NumPy code that mostly releases the GIL,
+        # so columns are analyzed on a thread pool
+        def analyze_column(col):
             col_info = {
                 'dtype': str(self.df[col].dtype),
-                'non_null_count': int(self.df[col].count()),
-                'null_count': int(self.df[col].isnull().sum()),
-                'null_percentage': float(self.df[col].isnull().sum() / len(self.df) * 100),
-                'unique_count': int(self.df[col].nunique()),
-                'unique_percentage': float(self.df[col].nunique() / len(self.df) * 100)
+                'non_null_count': int(non_null[col]),
+                'null_count': int(nulls[col]),
+                'null_percentage': float(nulls[col] / n_rows * 100),
+                'unique_count': int(n_unique[col]),
+                'unique_percentage': float(n_unique[col] / n_rows * 100)
             }
             
             # Type-specific analysis
-            if self.df[col].dtype in ['int64', 'float64', 'int32', 'float32']:
+            kind = column_kinds[col]
+            if kind == 'numerical':
                 # Numerical column
+                stats = numerical_stats.loc[col]
                 col_info.update({
-                    'min': float(self.df[col].min()) if pd.notna(self.df[col].min()) else None,
-                    'max': float(self.df[col].max()) if pd.notna(self.df[col].max()) else None,
-                    'mean': float(self.df[col].mean()) if pd.notna(self.df[col].mean()) else None,
-                    'median': float(self.df[col].median()) if pd.notna(self.df[col].median()) else None,
-                    'std': float(self.df[col].std()) if pd.notna(self.df[col].std()) else None,
-                    'q25': float(self.df[col].quantile(0.25)) if pd.notna(self.df[col].quantile(0.25)) else None,
-                    'q75': float(self.df[col].quantile(0.75)) if pd.notna(self.df[col].quantile(0.75)) else None
+                    key: float(stats[stat]) if pd.notna(stats[stat]) else None
+                    for key, stat in (('min', 'min'), ('max', 'max'), ('mean', 'mean'), ('median', 'median'),
+                                      ('std', 'std'), ('q25', '25%'), ('q75', '75%'))
                 })
-            elif self.df[col].dtype == 'object':
+            elif kind == 'object':
                 # Categorical/string column
-                top_values = self.df[col].value_counts().head(5)
+                top_values = _top_value_counts(self.df[col])
+                all_null = nulls[col] == n_rows
+                # len(str(v)) matches astype(str).str.len(); str() returns str values as-is, so nothing is copied
+                values = self.df[col].to_numpy()
+                lengths = None if all_null else np.fromiter(map(len, map(str, values)), dtype=np.int64, count=len(values))
                 col_info.update({
-                    'top_values': {str(k): int(v) for k, v in top_values.items()},
-                    'avg_length': float(self.df[col].astype(str).str.len().mean()) if not self.df[col].isnull().all() else None,
-                    'max_length': int(self.df[col].astype(str).str.len().max()) if not self.df[col].isnull().all() else None
+                    'top_values': {str(k): int(v) for k, v in top_values},
+                    'avg_length': float(lengths.mean()) if not all_null else None,
+                    'max_length': int(lengths.max()) if not all_null else None
                 })
-            elif self.df[col].dtype in ['datetime64[ns]', 'datetime64[ns, UTC]']:
+            elif kind == 'datetime':
                 # Datetime column
+                min_date = min_dates[col]
+                max_date = max_dates[col]
                 col_info.update({
-                    'min_date': str(self.df[col].min()) if pd.notna(self.df[col].min()) else None,
-                    'max_date': str(self.df[col].max()) if pd.notna(self.df[col].max()) else None,
-                    'date_range_days': int((self.df[col].max() - self.df[col].min()).days) if pd.notna(self.df[col].min()) and pd.notna(self.df[col].max()) else None
+                    'min_date': str(min_date) if pd.notna(min_date) else None,
+                    'max_date': str(max_date) if pd.notna(max_date) else None,
+                    'date_range_days': int((max_date - min_date).days) if pd.notna(min_date) and pd.notna(max_date) else None
                 })
-            elif self.df[col].dtype == 'bool':
+            elif kind == 'bool':
                 # Boolean column
-                value_counts = self.df[col].value_counts()
+                true_count = int(true_counts[col])
                 col_info.update({
-                    'true_count': int(value_counts.get(True, 0)),
-                    'false_count': int(value_counts.get(False, 0)),
-                    'true_percentage': float(value_counts.get(True, 0) / len(self.df) * 100)
+                    'true_count': true_count,
+                    'false_count': int(non_null[col]) - true_count,
+                    'true_percentage': float(true_count / n_rows * 100)
                 })
             
-            schema_info['columns'][col] = col_info
+            return col_info
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(os.cpu_count() or 1, n_cols))) as pool:
+            # map() yields results in column order, so the schema keeps the frame's column order
+            schema_info['columns'] = dict(zip(self.df.columns, pool.map(analyze_column, self.df.columns)))
         
         # Overall summary statistics
+        total_null_cells = nulls.sum()
         schema_info['summary_stats'] = {
-            'total_rows': int(len(self.df)),
-            'total_columns': int(len(self.df.columns)),
+            'total_rows': int(n_rows),
+            'total_columns': int(n_cols),
             'memory_usage_mb': float(self.df.memory_usage(deep=True).sum() / 1024 / 1024),
-            'total_cells': int(len(self.df) * len(self.df.columns)),
-            'total_null_cells': int(self.df.isnull().sum().sum()),
-            'overall_null_percentage': float(self.df.isnull().sum().sum() / (len(self.df) * len(self.df.columns)) * 100)
+            'total_cells': int(n_rows * n_cols),
+            'total_null_cells': int(total_null_cells),
+            'overall_null_percentage': float(total_null_cells / (n_rows * n_cols) * 100)
         }
         
         # Data quality metrics
+        duplicate_rows = self.df.duplicated().sum()
         schema_info['data_quality'] = {
-            'columns_with_nulls': int((self.df.isnull().sum() > 0).sum()),
-            'columns_all_unique': int((self.df.nunique() == len(self.df)).sum()),
-            'columns_single_value': int((self.df.nunique() == 1).sum()),
-            'duplicate_rows': int(self.df.duplicated().sum()),
-            'duplicate_percentage': float(self.df.duplicated().sum() / len(self.df) * 100)
+            'columns_with_nulls': int((nulls > 0).sum()),
+            'columns_all_unique': int((n_unique == n_rows).sum()),
+            'columns_single_value': int((n_unique == 1).sum()),
+            'duplicate_rows': int(duplicate_rows),
+            'duplicate_percentage': float(duplicate_rows / n_rows * 100)
         }
         
         # Data type distribution
@@ -166,98 +410,177 @@ class DatasetFingerprinter:
         
         return schema_info
     
-    def generate_fingerprint(self):
-        """Generate complete dataset fingerprint"""
+    def content_hash_enabled(self):
+        """Whether generate_fingerprint computes the content hash for this file"""
+        if self.content_hash is not None:
+            return self.content_hash
+        # The file hash already detects exact copies; the content hash only adds
+        # row/column-order invariance, and on large files it costs far more
+        return os.path.getsize(self.file_path) <= CONTENT_HASH_MAX_BYTES
+    
+    def file_info(self):
+        """Collect file-level metadata (name, path, size, timestamps)"""
+        file_stats = os.stat(self.file_path)
+        
+        return {
+            'filename': self.file_path.name,
+            'file_path': str(self.file_path.absolute()),
+            'file_size_bytes': int(file_stats.st_size),
+            'file_size_mb': round(file_stats.st_size / 1024 / 1024, 2),
+            'file_extension': self.file_path.suffix.lower(),
+            'creation_time': datetime.fromtimestamp(file_stats.st_ctime).isoformat(),
+            'modification_time': datetime.fromtimestamp(file_stats.st_mtime).isoformat()
+        }
+    
+    def generate_fingerprint(self, tree_hash=False):
+        """Generate complete dataset fingerprint (tree_hash: use the parallel tree hash for the file hash)"""
         print("="*60)
         print("DATASET FINGERPRINTING")
         print("="*60)
         
-        # File information
-        file_stats = os.stat(self.file_path)
+        fingerprint_info = {
+            'generated_at': datetime.now().isoformat(),
+            'generator_version': GENERATOR_VERSION,
+        }
+        if tree_hash:
+            # Not comparable with a plain SHA-256, so it gets its own key; the chunk size makes it reproducible
+            fingerprint_info['file_hash_sha256_tree'] = self.generate_file_hash_parallel()
+            fingerprint_info['tree_hash_chunk_size'] = TREE_HASH_CHUNK_SIZE
+        else:
+            fingerprint_info['file_hash_sha256'] = self.generate_file_hash()
+        if self.content_hash_enabled():
+            fingerprint_info['content_hash_sha256'] = self.generate_content_hash()
+        else:
+            print("✓ Content hash skipped")
+            fingerprint_info['content_hash_sha256'] = None
         
         self.fingerprint_data = {
-            'file_info': {
-                'filename': self.file_path.name,
-                'file_path': str(self.file_path.absolute()),
-                'file_size_bytes': int(file_stats.st_size),
-                'file_size_mb': round(file_stats.st_size / 1024 / 1024, 2),
-                'file_extension': self.file_path.suffix.lower(),
-                'creation_time': datetime.fromtimestamp(file_stats.st_ctime).isoformat(),
-                'modification_time': datetime.fromtimestamp(file_stats.st_mtime).isoformat()
-            },
-            'fingerprint_info': {
-                'generated_at': datetime.now().isoformat(),
-                'generator_version': '1.0.0',
-                'file_hash_sha256': self.generate_file_hash(),
-                'content_hash_sha256': self.generate_content_hash()
-            },
+            'file_info': self.file_info(),
+            'fingerprint_info': fingerprint_info,
             'schema': self.analyze_schema()
         }
         
         return self.fingerprint_data
     
+    def _cache_path(self, tree_hash=False):
+        """Cache file for the current state of the dataset file; any change to it yields a new key"""
+        stat = self.file_path.stat()
+        with open(self.file_path, 'rb') as f:
+            head_digest = hashlib.sha256(f.read(CACHE_HEAD_BYTES)).hexdigest()
+        key = '|'.join([str(self.file_path.resolve()), str(stat.st_size), str(stat.st_mtime_ns),
+                        head_digest, 'tree' if tree_hash else 'flat',
+                        'content' if self.content_hash_enabled() else 'no-content', GENERATOR_VERSION])
+        return FINGERPRINT_CACHE_DIR / f"{hashlib.sha256(key.encode()).hexdigest()}.json"
+    
+    def _cache_lookup(self, tree_hash=False):
+        """Load a cached fingerprint of the unchanged file into fingerprint_data; returns it, or None on a miss"""
+        try:
+            with open(self._cache_path(tree_hash), 'rb') as f:
+                fingerprint_data = orjson.loads(f.read()) if orjson is not None else json.load(f)
+        except (OSError, ValueError):
+            return None
+        # Fingerprints from an older generator may hash content differently
+        if fingerprint_data.get('fingerprint_info', {}).get('generator_version') != GENERATOR_VERSION:
+            return None
+        
+        print(f"✓ Reusing cached fingerprint for unchanged file: {self.file_path.name}")
+        self.fingerprint_data = fingerprint_data
+        return fingerprint_data
+    
+    def _cache_store(self, tree_hash=False):
+        """Write fingerprint_data to the local cache; os.replace keeps readers off partial files"""
+        try:
+            cache_path = self._cache_path(tree_hash)
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+            if orjson is not None:
+                with open(tmp_path, 'wb') as f:
+                    f.write(orjson.dumps(self.fingerprint_data, default=str,
+                                         option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS))
+            else:
+                with open(tmp_path, 'w') as f:
+                    json.dump(self.fingerprint_data, f, default=str)
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            print(f"⚠️  Could not cache fingerprint: {str(e)}")
+    
+    def _file_hash_label(self):
+        """Describe the file hash that was recorded, plain or tree"""
+        info = self.fingerprint_data['fingerprint_info']
+        if 'file_hash_sha256_tree' in info:
+            return f"SHA-256 tree, {info['tree_hash_chunk_size'] // (1024 * 1024)} MB chunks"
+        return "SHA-256"
+    
+    def _file_hash_value(self):
+        """Return whichever file hash was recorded"""
+        info = self.fingerprint_data['fingerprint_info']
+        return info.get('file_hash_sha256_tree') or info['file_hash_sha256']
+    
     def print_fingerprint_summary(self):
         """Print a formatted summary of the fingerprint"""
-        print("\n" + "="*60)
-        print("DATASET FINGERPRINT SUMMARY")
-        print("="*60)
+        # Buffered and written with a single print; wide schemas otherwise issue hundreds of writes
+        lines = ["\n" + "="*60]
+        lines.append("DATASET FINGERPRINT SUMMARY")
+        lines.append("="*60)
         
         # Header information
-        print(f"Dataset: {self.fingerprint_data['file_info']['filename']}")
-        print(f"Generated: {self.fingerprint_data['fingerprint_info']['generated_at']}")
-        print(f"File Hash (SHA-256): {self.fingerprint_data['fingerprint_info']['file_hash_sha256']}")
+        lines.append(f"Dataset: {self.fingerprint_data['file_info']['filename']}")
+        lines.append(f"Generated: {self.fingerprint_data['fingerprint_info']['generated_at']}")
+        lines.append(f"File Hash ({self._file_hash_label()}): {self._file_hash_value()}")
         if self.fingerprint_data['fingerprint_info']['content_hash_sha256']:
-            print(f"Content Hash (SHA-256): {self.fingerprint_data['fingerprint_info']['content_hash_sha256']}")
-        
-        print("\n" + "-"*40)
-        print("FILE INFORMATION")
-        print("-"*40)
-        print(f"File Size: {self.fingerprint_data['file_info']['file_size_mb']} MB")
-        print(f"File Type: {self.fingerprint_data['file_info']['file_extension']}")
-        print(f"Last Modified: {self.fingerprint_data['file_info']['modification_time']}")
-        
-        print("\n" + "-"*40)
-        print("DATASET STRUCTURE")
-        print("-"*40)
+            lines.append(f"Content Hash (SHA-256): {self.fingerprint_data['fingerprint_info']['content_hash_sha256']}")
+        
+        lines.append("\n" + "-"*40)
+        lines.append("FILE INFORMATION")
+        lines.append("-"*40)
+        lines.append(f"File Size: {self.fingerprint_data['file_info']['file_size_mb']} MB")
+        lines.append(f"File Type: {self.fingerprint_data['file_info']['file_extension']}")
+        lines.append(f"Last Modified: {self.fingerprint_data['file_info']['modification_time']}")
+        
+        lines.append("\n" + "-"*40)
+        lines.append("DATASET STRUCTURE")
+        lines.append("-"*40)
         stats = self.fingerprint_data['schema']['summary_stats']
-        print(f"Rows: {stats['total_rows']:,}")
-        print(f"Columns: {stats['total_columns']:,}")
-        print(f"Memory Usage: {stats['memory_usage_mb']:.2f} MB")
-        print(f"Total Cells: {stats['total_cells']:,}")
-        print(f"Null Cells: {stats['total_null_cells']:,} ({stats['overall_null_percentage']:.2f}%)")
-        
-        print("\n" + "-"*40)
-        print("DATA TYPES")
-        print("-"*40)
+        lines.append(f"Rows: {stats['total_rows']:,}")
+        lines.append(f"Columns: {stats['total_columns']:,}")
+        lines.append(f"Memory Usage: {stats['memory_usage_mb']:.2f} MB")
+        lines.append(f"Total Cells: {stats['total_cells']:,}")
+        lines.append(f"Null Cells: {stats['total_null_cells']:,} ({stats['overall_null_percentage']:.2f}%)")
+        
+        lines.append("\n" + "-"*40)
+        lines.append("DATA TYPES")
+        lines.append("-"*40)
         for dtype, count in self.fingerprint_data['schema']['data_type_distribution'].items():
-            print(f"{dtype}: {count} columns")
+            lines.append(f"{dtype}: {count} columns")
         
-        print("\n" + "-"*40)
-        print("DATA QUALITY")
-        print("-"*40)
+        lines.append("\n" + "-"*40)
+        lines.append("DATA QUALITY")
+        lines.append("-"*40)
         quality = self.fingerprint_data['schema']['data_quality']
-        print(f"Columns with nulls: {quality['columns_with_nulls']}")
-        print(f"Duplicate rows: {quality['duplicate_rows']} ({quality['duplicate_percentage']:.2f}%)")
-        print(f"Single-value columns: {quality['columns_single_value']}")
-        print(f"All-unique columns: {quality['columns_all_unique']}")
-        
-        print("\n" + "-"*40)
-        print("COLUMN DETAILS")
-        print("-"*40)
+        lines.append(f"Columns with nulls: {quality['columns_with_nulls']}")
+        lines.append(f"Duplicate rows: {quality['duplicate_rows']} ({quality['duplicate_percentage']:.2f}%)")
+        lines.append(f"Single-value columns: {quality['columns_single_value']}")
+        lines.append(f"All-unique columns: {quality['columns_all_unique']}")
+        
+        lines.append("\n" + "-"*40)
+        lines.append("COLUMN DETAILS")
+        lines.append("-"*40)
         for col_name, col_info in self.fingerprint_data['schema']['columns'].items():
-            print(f"\n{col_name}:")
-            print(f"  Type: {col_info['dtype']}")
-            print(f"  Non-null: {col_info['non_null_count']:,} ({100-col_info['null_percentage']:.1f}%)")
-            print(f"  Unique: {col_info['unique_count']:,} ({col_info['unique_percentage']:.1f}%)")
+            lines.append(f"\n{col_name}:")
+            lines.append(f"  Type: {col_info['dtype']}")
+            lines.append(f"  Non-null: {col_info['non_null_count']:,} ({100-col_info['null_percentage']:.1f}%)")
+            lines.append(f"  Unique: {col_info['unique_count']:,} ({col_info['unique_percentage']:.1f}%)")
             
-            if col_info['dtype'] in ['int64', 'float64', 'int32', 'float32']:
+            if 'mean' in col_info:
                 if col_info['mean'] is not None:
-                    print(f"  Range: {col_info['min']:.2f} to {col_info['max']:.2f}")
-                    print(f"  Mean: {col_info['mean']:.2f}, Std: {col_info['std']:.2f}")
-            elif col_info['dtype'] == 'object' and 'top_values' in col_info:
-                print(f"  Top values: {list(col_info['top_values'].keys())[:3]}")
+                    lines.append(f"  Range: {col_info['min']:.2f} to {col_info['max']:.2f}")
+                    lines.append(f"  Mean: {col_info['mean']:.2f}, Std: {col_info['std']:.2f}")
+            elif 'top_values' in col_info:
+                lines.append(f"  Top values: {list(col_info['top_values'].keys())[:3]}")
                 if col_info['avg_length']:
-                    print(f"  Avg length: {col_info['avg_length']:.1f} chars")
+                    lines.append(f"  Avg length: {col_info['avg_length']:.1f} chars")
+        
+        print("\n".join(lines))
     
     def save_fingerprint(self, output_path=None):
         """Save fingerprint to JSON file"""
@@ -265,8 +588,15 @@ class DatasetFingerprinter:
             output_path = self.file_path.with_suffix('.fingerprint.json')
         
         try:
-            with open(output_path, 'w') as f:
-                json.dump(self.fingerprint_data, f, indent=2, default=str)
+            if orjson is not None:
+                # Encodes numpy scalars natively in one C pass instead of str()-ing them
+                with open(output_path, 'wb') as f:
+                    f.write(orjson.dumps(self.fingerprint_data, default=str,
+                                         option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY |
+                                         orjson.OPT_NON_STR_KEYS))
+            else:
+                with open(output_path, 'w') as f:
+                    json.dump(self.fingerprint_data, f, indent=2, default=str)
             
             print(f"\n✓ Fingerprint saved to: {output_path}")
             return output_path
@@ -285,7 +615,7 @@ class DatasetFingerprinter:
         # Essential information for reports
         report_lines.append(f"Dataset: {self.fingerprint_data['file_info']['filename']}")
         report_lines.append(f"Generated: {self.fingerprint_data['fingerprint_info']['generated_at']}")
-        report_lines.append(f"SHA-256 Hash: {self.fingerprint_data['fingerprint_info']['file_hash_sha256']}")
+        report_lines.append(f"File Hash ({self._file_hash_label()}): {self._file_hash_value()}")
         report_lines.append(f"File Size: {self.fingerprint_data['file_info']['file_size_mb']} MB")
         
         stats = self.fingerprint_data['schema']['summary_stats']
@@ -310,18 +640,29 @@ def main():
     parser.add_argument('--output', '-o', help='Output path for fingerprint JSON')
     parser.add_argument('--report', '-r', help='Output path for printable report')
     parser.add_argument('--quiet', '-q', action='store_true', help='Suppress detailed output')
+    parser.add_argument('--tree-hash', action='store_true',
+                        help='Hash large files on all cores with a SHA-256 tree hash (differs from plain SHA-256)')
+    parser.add_argument('--content-hash', action=argparse.BooleanOptionalAction, default=None,
+                        help=f'Compute the order-independent content hash (default: only for files up to '
+                             f'{CONTENT_HASH_MAX_BYTES // (1024 * 1024)} MB)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help=f'Always recompute instead of reusing fingerprints cached in {FINGERPRINT_CACHE_DIR}')
     
     args = parser.parse_args()
     
     try:
         # Initialize fingerprinter
-        fingerprinter = DatasetFingerprinter(args.dataset_file)
+        fingerprinter = DatasetFingerprinter(args.dataset_file, content_hash=args.content_hash)
         
-        # Load dataset
-        fingerprinter.load_dataset()
-        
-        # Generate fingerprint
-        fingerprinter.generate_fingerprint()
+        # Unchanged files reuse their cached fingerprint without being loaded or re-hashed
+        if args.no_cache or fingerprinter._cache_lookup(args.tree_hash) is None:
+            # Load dataset
+            fingerprinter.load_dataset()
+            
+            # Generate fingerprint
+            fingerprinter.generate_fingerprint(tree_hash=args.tree_hash)
+            if not args.no_cache:
+                fingerprinter._cache_store(args.tree_hash)
         
         # Print summary unless quiet mode
         if not args.quiet:
@@ -5,6 +5,7 @@ import dotenv from "dotenv";
 import bcrypt from "bcryptjs";
 import jwt from "jsonwebtoken";
 import { v4 as uuidv4 } from "uuid";
+import { createHash } from "crypto";
 
 import User from "./User.js";
 
@@ -92,6 +93,8 @@ app.post("/generate-api-key", async (req, res) => {
     // Else generate
     const apiKey = uuidv4();
     user.apiKey = apiKey;
+    // The verification API looks keys up by their SHA-256 digest
+    user.apiKeyHash = createHash("sha256").update(apiKey).digest();
     await user.save();
 
     return res.status(200).json({ apiKey });
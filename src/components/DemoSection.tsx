@@ -104,8 +104,8 @@ const DemoSection = () => {
         fingerprint: fingerprintResponse.data.summary,
         issuesFlags: generateIssueFlags(assessmentScore),
         recommendations: generateRecommendations(assessmentScore),
-        badgeUrl: badgeResponse.data.badge_image ? `data:image/png;base64,${badgeResponse.data.badge_image}` : undefined,
-        biasVisualizations: biasResponse.data.visualizations || {},
+        badgeUrl: badgeResponse.data.badge_image_url || undefined,
+        biasVisualizations: biasResponse.data.visualization_urls || {},
         comprehensiveReport: reportResponse.data.report_content,
         sessionId
       };
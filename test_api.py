@@ -6,6 +6,12 @@ Simple test script to verify API endpoints are working
 import requests
 import json
 import time
+from requests.adapters import HTTPAdapter
+
+# One pooled session so repeated checks reuse the same keep-alive connection
+SESSION = requests.Session()
+SESSION.mount('http://', HTTPAdapter(pool_connections=16, pool_maxsize=16))
+REQUEST_TIMEOUT = 10  # seconds
 
 def test_api():
     base_url = "http://localhost:5000"
@@ -15,7 +21,7 @@ def test_api():
     
     # Test health endpoint
     try:
-        response = requests.get(f"{base_url}/api/health")
+        response = SESSION.get(f"{base_url}/api/health", timeout=REQUEST_TIMEOUT)
         if response.status_code == 200:
             print("✅ Health check passed")
             print(f"   Response: {response.json()}")
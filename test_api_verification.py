@@ -6,11 +6,17 @@ Test script for API verification
 import os
 import sys
 import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+# One pooled session so the health check and key verification share a keep-alive connection
+SESSION = requests.Session()
+SESSION.mount('http://', HTTPAdapter(pool_connections=16, pool_maxsize=16))
+REQUEST_TIMEOUT = 10  # seconds; verify_key may wait on MongoDB
+
 def test_api_verification():
     """Test the API verification endpoint"""
     
@@ -27,7 +33,7 @@ def test_api_verification():
     
     try:
         # Test the verify_key endpoint
-        response = requests.get(f"{base_url}/verify_key", params={"api_key": test_api_key})
+        response = SESSION.get(f"{base_url}/verify_key", params={"api_key": test_api_key}, timeout=REQUEST_TIMEOUT)
         
         print(f"Status Code: {response.status_code}")
         print(f"Response: {response.text}")
@@ -60,7 +66,7 @@ def test_health_check():
     print("-" * 50)
     
     try:
-        response = requests.get(f"{base_url}/health")
+        response = SESSION.get(f"{base_url}/health", timeout=REQUEST_TIMEOUT)
         
         print(f"Status Code: {response.status_code}")
         print(f"Response: {response.text}")